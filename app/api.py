@@ -3,16 +3,17 @@
 import asyncio
 
 
-from   fastapi   import FastAPI, HTTPException, UploadFile, WebSocket, WebSocketDisconnect, File, Form
-from   pydantic  import BaseModel
-from   typing    import Any, Dict, List, Optional
+from   dataclasses import dataclass
+from   fastapi     import FastAPI, HTTPException, Response, UploadFile, WebSocket, WebSocketDisconnect, File, Form
+from   pydantic    import BaseModel
+from   typing      import Any, Dict, List, Optional
 
 
-from   engine    import WorkflowEngine
-from   event_bus import EventType, EventBus
-from   manager   import WorkflowManager
-from   schema    import Workflow
-from   utils     import get_now_str, get_timestamp_str, log_print, serialize_result
+from   engine      import WorkflowEngine
+from   event_bus   import EventType, EventBus
+from   manager     import WorkflowManager
+from   schema      import Workflow
+from   utils       import get_now_str, get_timestamp_str, log_print, serialize_result, splice_json
 
 
 class WorkflowUploadRequest(BaseModel):
@@ -34,16 +35,37 @@ class ToolCallRequest(BaseModel):
 	args : Any
 
 
+@dataclass(slots=True)
+class APIState:
+	server    : Any
+	event_bus : EventBus
+	manager   : WorkflowManager
+	engine    : WorkflowEngine
+
+
+def _raw_json_response(fields: Dict[str, Any]) -> Response:
+	return Response(content=splice_json(fields), media_type="application/json")
+
+
 def setup_api(server: Any, app: FastAPI, event_bus: EventBus, schema_code: str, manager: WorkflowManager, engine: WorkflowEngine):
+	api = APIState(
+		server    = server,
+		event_bus = event_bus,
+		manager   = manager,
+		engine    = engine,
+	)
+
+	schema_result = {
+		"schema": schema_code,
+	}
 
 	@app.post("/shutdown")
 	async def shutdown_server():
-		nonlocal engine, server
-		await engine.cancel_execution()
-		if server and server.should_exit is False:
-			server.should_exit = True
-		engine = None
-		server = None
+		await api.engine.cancel_execution()
+		if api.server and api.server.should_exit is False:
+			api.server.should_exit = True
+		api.engine = None
+		api.server = None
 		result = {
 			"status"  : "none",
 			"message" : "Server shut down",
@@ -53,10 +75,9 @@ def setup_api(server: Any, app: FastAPI, event_bus: EventBus, schema_code: str,
 
 	@app.post("/status")
 	async def server_status():
-		nonlocal engine
 		result = {
 			"status"     : "ready",
-			"executions" : engine.get_all_execution_states(),
+			"executions" : api.engine.get_execution_state(),
 		}
 		return result
 
@@ -72,11 +93,7 @@ def setup_api(server: Any, app: FastAPI, event_bus: EventBus, schema_code: str,
 
 	@app.post("/schema")
 	async def export_schema():
-		nonlocal schema_code
-		result = {
-			"schema": schema_code,
-		}
-		return result
+		return schema_result
 
 
 	@app.post("/chat_open/{name}")
@@ -114,23 +131,21 @@ def setup_api(server: Any, app: FastAPI, event_bus: EventBus, schema_code: str,
 
 	@app.post("/add")
 	async def add_workflow(request: WorkflowUploadRequest):
-		nonlocal manager
-		name = await manager.add(request.workflow, request.name)
-		impl = await manager.impl(name)
-		wf   = impl["workflow"].model_dump() if impl else None
+		name = await api.manager.add(request.workflow, request.name)
+		impl = await api.manager.impl(name)
+		wf   = impl["workflow"].model_dump_json().encode() if impl else None
 		result = {
 			"name"     : name,
 			"workflow" : wf,
 			"status"   : "added" if name else "failed",
 		}
-		return result
+		return _raw_json_response(result)
 
 
 	@app.post("/remove")
 	@app.post("/remove/{name}")
 	async def remove_workflow(name: Optional[str] = None):
-		nonlocal manager
-		status = await manager.remove(name)
+		status = await api.manager.remove(name)
 		result = {
 			"name"   : name,
 			"status" : "removed" if status else "failed",
@@ -141,21 +156,17 @@ def setup_api(server: Any, app: FastAPI, event_bus: EventBus, schema_code: str,
 	@app.post("/get")
 	@app.post("/get/{name}")
 	async def get_workflow(name: Optional[str] = None):
-		nonlocal manager
-		workflow = await manager.get(name)
-		if workflow:
-			workflow = workflow["workflow"].model_dump()
+		workflow = await api.manager.get_json(name)
 		result   = {
 			"name"     : name,
 			"workflow" : workflow,
 		}
-		return result
+		return _raw_json_response(result)
 
 
 	@app.post("/list")
 	async def list_workflows():
-		nonlocal manager
-		names  = await manager.list()
+		names  = await api.manager.list()
 		result = {
 			"names": names,
 		}
@@ -164,12 +175,11 @@ def setup_api(server: Any, app: FastAPI, event_bus: EventBus, schema_code: str,
 
 	@app.post("/start")
 	async def start_workflow(request: WorkflowStartRequest):
-		nonlocal engine, manager
 		try:
-			impl = await manager.impl(request.name)
+			impl = await api.manager.impl(request.name)
 			if not impl:
-				raise HTTPException(status_code=404, detail=f"Workflow 'request.name' not found")
-			execution_id = await engine.start_workflow(
+				raise HTTPException(status_code=404, detail=f"Workflow '{request.name}' not found")
+			execution_id = await api.engine.start_workflow(
 				workflow     = impl["workflow"],
 				backend      = impl["backend"],
 				initial_data = request.initial_data,
@@ -179,6 +189,8 @@ def setup_api(server: Any, app: FastAPI, event_bus: EventBus, schema_code: str,
 				"status"       : "started",
 			}
 			return result
+		except HTTPException:
+			raise
 		except Exception as e:
 			log_print(f"Error starting workflow: {e}")
 			raise HTTPException(status_code=500, detail=str(e))
@@ -186,9 +198,8 @@ def setup_api(server: Any, app: FastAPI, event_bus: EventBus, schema_code: str,
 
 	@app.post("/exec_list")
 	async def list_executions():
-		nonlocal engine
 		try:
-			execution_ids = engine.list_executions()
+			execution_ids = api.engine.list_executions()
 			result =  {
 				"execution_ids": execution_ids,
 			}
@@ -201,8 +212,7 @@ def setup_api(server: Any, app: FastAPI, event_bus: EventBus, schema_code: str,
 	@app.post("/exec_state")
 	@app.post("/exec_state/{execution_id}")
 	async def execution_state(execution_id: Optional[str] = None):
-		nonlocal engine
-		state  = engine.get_execution_state(execution_id)
+		state  = api.engine.get_execution_state(execution_id)
 		result = {
 			"execution_id" : execution_id,
 			"state"        : state,
@@ -213,9 +223,8 @@ def setup_api(server: Any, app: FastAPI, event_bus: EventBus, schema_code: str,
 	@app.post("/exec_cancel")
 	@app.post("/exec_cancel/{execution_id}")
 	async def cancel_execution(execution_id: Optional[str] = None):
-		nonlocal engine
 		try:
-			state  = await engine.cancel_execution(execution_id)
+			state  = await api.engine.cancel_execution(execution_id)
 			result =  {
 				"execution_id" : execution_id,
 				"status"       : "cancelled" if state else "failed",
@@ -229,9 +238,8 @@ def setup_api(server: Any, app: FastAPI, event_bus: EventBus, schema_code: str,
 
 	@app.post("/exec_input/{execution_id}")
 	async def provide_user_input(execution_id: str, request: UserInputRequest):
-		nonlocal engine
 		try:
-			await engine.provide_user_input(
+			await api.engine.provide_user_input(
 				execution_id = execution_id,
 				node_id      = request.node_id,
 				user_input   = request.input_data
@@ -256,13 +264,12 @@ def setup_api(server: Any, app: FastAPI, event_bus: EventBus, schema_code: str,
 		button_id  : str = Form(None),
 	):
 		"""Handle file uploads from node drop zones or buttons"""
-		nonlocal event_bus, manager
 		
 		upload_id = f"upload_{node_index}_{get_timestamp_str()}"
 		
 		try:
 			# Get current workflow to find node info
-			impl = await manager.impl()
+			impl = await api.manager.impl()
 			if not impl:
 				raise HTTPException(status_code=404, detail="No active workflow")
 			
@@ -273,7 +280,7 @@ def setup_api(server: Any, app: FastAPI, event_bus: EventBus, schema_code: str,
 			node = workflow.nodes[node_index]
 			
 			# === PHASE 1: UPLOAD ===
-			await event_bus.emit(
+			await api.event_bus.emit(
 				EventType.UPLOAD_STARTED,
 				node_id = str(node_index),
 				data    = {
@@ -302,7 +309,7 @@ def setup_api(server: Any, app: FastAPI, event_bus: EventBus, schema_code: str,
 				total_size += file_size
 			
 			# Upload complete
-			await event_bus.emit(
+			await api.event_bus.emit(
 				EventType.UPLOAD_COMPLETED,
 				node_id = str(node_index),
 				data    = {
@@ -315,10 +322,10 @@ def setup_api(server: Any, app: FastAPI, event_bus: EventBus, schema_code: str,
 			
 			# === PHASE 2: PROCESSING ===
 			handler_result = None
-			handler        = await manager.get_upload_handler(node.type)
+			handler        = await api.manager.get_upload_handler(node.type)
 			
 			if handler:
-				await event_bus.emit(
+				await api.event_bus.emit(
 					EventType.PROCESSING_STARTED,
 					node_id = str(node_index),
 					data    = {
@@ -335,7 +342,7 @@ def setup_api(server: Any, app: FastAPI, event_bus: EventBus, schema_code: str,
 					else:
 						handler_result = handler(impl, node_index, button_id, uploaded)
 					
-					await event_bus.emit(
+					await api.event_bus.emit(
 						EventType.PROCESSING_COMPLETED,
 						node_id = str(node_index),
 						data    = {
@@ -347,7 +354,7 @@ def setup_api(server: Any, app: FastAPI, event_bus: EventBus, schema_code: str,
 					
 				except Exception as e:
 					log_print(f"Processing handler error: {e}")
-					await event_bus.emit(
+					await api.event_bus.emit(
 						EventType.PROCESSING_FAILED,
 						node_id = str(node_index),
 						error   = str(e),
@@ -381,7 +388,7 @@ def setup_api(server: Any, app: FastAPI, event_bus: EventBus, schema_code: str,
 			raise
 		except Exception as e:
 			log_print(f"Error in upload: {e}")
-			await event_bus.emit(
+			await api.event_bus.emit(
 				EventType.UPLOAD_FAILED,
 				node_id = str(node_index),
 				error   = str(e),
@@ -395,17 +402,22 @@ def setup_api(server: Any, app: FastAPI, event_bus: EventBus, schema_code: str,
 
 	@app.websocket("/events")
 	async def workflow_events(websocket: WebSocket):
-		nonlocal event_bus
-		await event_bus.add_websocket_client(websocket)
+		await api.event_bus.add_websocket_client(websocket)
 		try:
 			while True:
-				data = await websocket.receive_text()
+				# raw receive, accepts text and binary frames without forcing a decode
+				message = await websocket.receive()
+				if message["type"] == "websocket.disconnect":
+					raise WebSocketDisconnect(message.get("code", 1000))
+				data = message.get("text")
+				if data is None:
+					data = message.get("bytes", b"").decode("utf-8", errors="replace")
 				log_print(f"Received WebSocket message: {data}")
 		except WebSocketDisconnect:
 			log_print("WebSocket client disconnected")
 		except Exception as e:
 			log_print(f"WebSocket error: {e}")
-		event_bus.remove_websocket_client(websocket)
+		api.event_bus.remove_websocket_client(websocket)
 
 
 	log_print("✅ Workflow API endpoints registered")
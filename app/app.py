@@ -7,6 +7,7 @@ import uvicorn
 
 from   dotenv                  import load_dotenv
 from   fastapi                 import FastAPI
+from   fastapi.responses       import JSONResponse, ORJSONResponse
 from   fastapi.middleware.cors import CORSMiddleware
 from   inspect                 import getsource
 from   typing                  import Any
@@ -25,10 +26,28 @@ from   utils                   import log_print, seed_everything
 load_dotenv()
 
 
+try:
+	import orjson
+	DEFAULT_RESPONSE_CLASS = ORJSONResponse
+except ImportError:
+	DEFAULT_RESPONSE_CLASS = JSONResponse
+
+
+try:
+	import uvloop
+	DEFAULT_ASYNC_RUN = uvloop.run
+except ImportError:
+	DEFAULT_ASYNC_RUN = asyncio.run
+
+
 DEFAULT_APP_SEED : int = 777
 DEFAULT_APP_PORT : int = 8000
 
 
+# schema.py is static for the life of the process
+SCHEMA_CODE : str = getsource(schema)
+
+
 async def run_server(args: Any):
 	log_print("Server starting...")
 
@@ -38,11 +57,11 @@ async def run_server(args: Any):
 	event_bus   : EventBus        = get_event_bus   ()
 	manager     : WorkflowManager = WorkflowManager (args.port, event_bus)
 	engine      : WorkflowEngine  = WorkflowEngine  (event_bus)
-	schema_code : str             = getsource       (schema)
+	schema_code : str             = SCHEMA_CODE
 
 	await manager.initialize()
 
-	app : FastAPI = FastAPI(title="App")
+	app : FastAPI = FastAPI(title="App", default_response_class=DEFAULT_RESPONSE_CLASS)
 	app.add_middleware(
 		CORSMiddleware,
 		allow_credentials = False,
@@ -53,7 +72,7 @@ async def run_server(args: Any):
 
 	host   = "0.0.0.0"
 	port   = args.port
-	config = uvicorn.Config(app, host=host, port=port)
+	config = uvicorn.Config(app, host=host, port=port, access_log=False)
 	server = uvicorn.Server(config)
 
 	setup_api(server, app, event_bus, schema_code, manager, engine)
@@ -70,7 +89,7 @@ def main():
 	parser .add_argument("--seed", type=int, default=DEFAULT_APP_SEED, help="Seed for pseudorandom number generator")
 	args   = parser.parse_args()
 
-	asyncio.run(run_server(args))
+	DEFAULT_ASYNC_RUN(run_server(args))
 
 
 if __name__ == "__main__":
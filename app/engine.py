@@ -8,13 +8,13 @@ from   collections import defaultdict
 from   datetime    import datetime
 from   enum        import Enum
 from   functools   import partial
-from   pydantic    import BaseModel
+from   pydantic    import BaseModel, ConfigDict, Field
 from   typing      import Any, Dict, List, Optional, Set, Tuple
 
 
 from   event_bus   import EventType, EventBus
 from   nodes       import ImplementedBackend, NodeExecutionContext, NodeExecutionResult, create_node
-from   schema      import Edge, BaseType, BaseNode, Workflow
+from   schema      import Edge, BaseType, BaseNode, Workflow, split_slot
 
 
 DEFAULT_ENGINE_NODE_DELAY_SEC         : float = 0.0
@@ -35,19 +35,27 @@ class WorkflowNodeStatus(str, Enum):
 
 class WorkflowExecutionState(BaseModel):
 	"""State of a workflow execution"""
+	# mutated in place at runtime, never revalidate
+	model_config = ConfigDict(validate_assignment=False, revalidate_instances="never")
+
 	workflow_id     : str
 	execution_id    : str
 	status          : WorkflowNodeStatus
-	pending_nodes   : List[int] = []
-	ready_nodes     : List[int] = []
-	running_nodes   : List[int] = []
-	completed_nodes : List[int] = []
-	failed_nodes    : List[int] = []
-	node_outputs    : Dict[int, Dict[str, Any]] = {}
+	pending_nodes   : List[int] = Field(default_factory=list)
+	ready_nodes     : List[int] = Field(default_factory=list)
+	running_nodes   : List[int] = Field(default_factory=list)
+	completed_nodes : List[int] = Field(default_factory=list)
+	failed_nodes    : List[int] = Field(default_factory=list)
+	node_outputs    : Dict[int, Dict[str, Any]] = Field(default_factory=dict)
 	start_time      : Optional[str] = None
 	end_time        : Optional[str] = None
 	error           : Optional[str] = None
 
+	@classmethod
+	def fast_new(cls, **kwargs) -> "WorkflowExecutionState":
+		"""Build without validation, for states created internally from trusted values"""
+		return cls.model_construct(**kwargs)
+
 
 class WorkflowEngine:
 	"""Frontier-based workflow execution engine"""
@@ -64,7 +72,7 @@ class WorkflowEngine:
 		execution_id = str(uuid.uuid4())
 		workflow_id  = workflow.info.name if workflow.info else "workflow"
 
-		state = WorkflowExecutionState(
+		state = WorkflowExecutionState.fast_new(
 			workflow_id  = workflow_id,
 			execution_id = execution_id,
 			status       = WorkflowNodeStatus.RUNNING,
@@ -105,14 +113,12 @@ class WorkflowEngine:
 					completed.add(i)
 
 			edges = workflow.edges or []
-			active_edges = [e for e in edges if isinstance(nodes[e.source], BaseNode) and isinstance(nodes[e.target], BaseNode)]
 
 			# Instantiate node executors
 			node_instances = self._instantiate_nodes(nodes, edges, backend)
 
 			# Build dependency graph from edges
-			dependencies = self._build_dependencies (active_edges)
-			dependents   = self._build_dependents   (active_edges)
+			dependencies, dependents, incoming = self._build_graph(nodes, edges)
 
 			# Track node states
 			ready   = set()
@@ -148,7 +154,7 @@ class WorkflowEngine:
 						running.add(node_idx)
 
 						task = asyncio.create_task(self._execute_node(
-							nodes, edges, node_idx, node_instances[node_idx],
+							nodes, incoming[node_idx], node_idx, node_instances[node_idx],
 							node_outputs, dependencies, variables, state,
 							node_delay_sec
 						))
@@ -207,20 +213,20 @@ class WorkflowEngine:
 			)
 
 
-	def _build_dependencies(self, edges: List[Edge]) -> Dict[int, Set[int]]:
-		"""Build dependency graph: target -> set of sources"""
-		deps = defaultdict(set)
-		for edge in edges:
-			deps[edge.target].add(edge.source)
-		return deps
-
-
-	def _build_dependents(self, edges: List[Edge]) -> Dict[int, Set[int]]:
-		"""Build dependent graph: source -> set of targets"""
-		deps = defaultdict(set)
+	def _build_graph(self, nodes: List[BaseType], edges: List[Edge]) -> Tuple[Dict[int, Set[int]], Dict[int, Set[int]], List[List[Edge]]]:
+		"""Build in a single pass over edges:
+		dependencies (target -> set of sources) and dependents (source -> set of targets) between executable nodes,
+		incoming edge lists (target -> edges) for every node"""
+		dependencies = defaultdict(set)
+		dependents   = defaultdict(set)
+		incoming     = [[] for _ in range(len(nodes))]
+		executable   = [isinstance(node, BaseNode) for node in nodes]
 		for edge in edges:
-			deps[edge.source].add(edge.target)
-		return deps
+			incoming[edge.target].append(edge)
+			if executable[edge.source] and executable[edge.target]:
+				dependencies[edge.target].add(edge.source)
+				dependents  [edge.source].add(edge.target)
+		return dependencies, dependents, incoming
 
 
 	def _instantiate_nodes(self, nodes: List[BaseType], edges: List[Edge], backend: ImplementedBackend) -> List[Any]:
@@ -229,8 +235,16 @@ class WorkflowEngine:
 		instances      = [None] * len(nodes)
 		with_reference = []
 
+		# node types invoking a backend callable bound to their config node
+		runners = {
+			"tool_node"        : backend.run_tool,
+			"tool_batch_node"  : backend.run_tool,
+			"agent_node"       : backend.run_agent,
+			"agent_batch_node" : backend.run_agent,
+		}
+
 		for i, (node, impl) in enumerate(zip(nodes, backend.handles)):
-			if node.type == "agent_node" or node.type == "tool_node":
+			if node.type in runners:
 				with_reference.append(i)
 				continue
 			instances[i] = create_node(node, impl)
@@ -243,8 +257,7 @@ class WorkflowEngine:
 			node   = nodes[i]
 			impl   = backend.handles[i]
 			arg    = instances[links[i]["config"]].impl
-			fn     = backend.run_agent if node.type == "agent_node" else backend.run_tool
-			ref    = partial(fn, arg)
+			ref    = partial(runners[node.type], arg)
 			kwargs = {"ref": ref}
 			instances[i] = create_node(node, impl, **kwargs)
 
@@ -253,7 +266,7 @@ class WorkflowEngine:
 
 	async def _execute_node(self,
 		nodes        : List[BaseType],
-		edges        : List[Edge],
+		in_edges     : List[Edge],
 		node_idx     : int,
 		node         : Any,
 		node_outputs : Dict[int, Dict[str, Any]],
@@ -280,7 +293,7 @@ class WorkflowEngine:
 
 		try:
 			context = NodeExecutionContext()
-			context.inputs      = self._gather_inputs(edges, node_idx, node_outputs)
+			context.inputs, context.grouped_inputs = self._gather_inputs(in_edges, node_outputs)
 			context.variables   = variables
 			context.node_index  = node_idx
 			context.node_config = node_config
@@ -308,14 +321,12 @@ class WorkflowEngine:
 			return node_idx, result
 
 
-	def _gather_inputs(self, edges: List[Edge], node_idx: int, node_outputs: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
-		"""Gather input data from connected edges"""
-		inputs = {}
+	def _gather_inputs(self, edges: List[Edge], node_outputs: Dict[int, Dict[str, Any]]) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+		"""Gather input data from the node incoming edges, dotted slots are also grouped by their base name"""
+		inputs  = {}
+		grouped = {}
 
 		for edge in edges:
-			if edge.target != node_idx:
-				continue
-
 			if edge.source in node_outputs:
 				source_data = node_outputs[edge.source]
 				
@@ -324,14 +335,20 @@ class WorkflowEngine:
 				if edge.source_slot in source_data:
 					data = source_data[edge.source_slot]
 				else:
-					base_slot = edge.source_slot.split(".")[0]
+					base_slot = split_slot(edge.source_slot)[0]
 					if base_slot in source_data:
 						data = source_data[base_slot]
 
 				if data is not None:
 					inputs[edge.target_slot] = data
-
-		return inputs
+					base, dot, name = edge.target_slot.partition(".")
+					if dot:
+						group = grouped.get(base)
+						if group is None:
+							group = grouped[base] = {}
+						group[name] = data
+
+		return inputs, grouped
 
 
 	async def _handle_user_input(self, node_idx: int, node: Any, context: NodeExecutionContext, state: WorkflowExecutionState) -> NodeExecutionResult:
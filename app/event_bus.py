@@ -4,11 +4,12 @@ import asyncio
 import json
 
 
-from   datetime import datetime
-from   enum     import Enum
-from   fastapi  import WebSocket
-from   pydantic import BaseModel
-from   typing   import Any, Callable, Dict, List, Optional, Set
+from   collections import deque
+from   datetime    import datetime
+from   enum        import Enum
+from   fastapi     import WebSocket
+from   pydantic    import BaseModel, ConfigDict
+from   typing      import Any, Callable, Deque, Dict, List, Optional, Set
 
 
 class EventType(str, Enum):
@@ -69,6 +70,9 @@ class EventType(str, Enum):
 
 
 class WorkflowEvent(BaseModel):
+	# built internally from trusted values, never revalidate
+	model_config = ConfigDict(validate_assignment=False, revalidate_instances="never")
+
 	event_id     : str
 	event_type   : EventType
 	timestamp    : str
@@ -79,6 +83,11 @@ class WorkflowEvent(BaseModel):
 	data         : Optional[Dict[str, Any]] = None
 	error        : Optional[str]            = None
 
+	@classmethod
+	def fast_new(cls, **kwargs) -> "WorkflowEvent":
+		"""Build without validation, for events created internally from trusted values"""
+		return cls.model_construct(**kwargs)
+
 
 class EventBus:
 	"""
@@ -89,8 +98,8 @@ class EventBus:
 	def __init__(self):
 		self._subscribers       : Dict[EventType, List[Callable]] = {}
 		self._websocket_clients : Set[WebSocket]                  = set()
-		self._event_history     : List[WorkflowEvent]             = []
 		self._max_history       : int                             = 1000
+		self._event_history     : Deque[WorkflowEvent]            = deque(maxlen=self._max_history)
 		self._event_counter     : int                             = 0
 
 
@@ -109,10 +118,8 @@ class EventBus:
 
 	async def publish(self, event: WorkflowEvent):
 		"""Publish event to all subscribers and WebSocket clients"""
-		# Add to history
+		# Add to history, oldest events fall off the bounded deque
 		self._event_history.append(event)
-		if len(self._event_history) > self._max_history:
-			self._event_history.pop(0)
 
 		# Notify local subscribers
 		if event.event_type in self._subscribers:
@@ -134,19 +141,14 @@ class EventBus:
 		if not self._websocket_clients:
 			return
 
-		message = json.dumps({
-			"type"  : "workflow_event",
-			"event" : event.model_dump()
-		})
+		# Serialize once in pydantic-core, then send to all clients concurrently
+		message = '{"type":"workflow_event","event":' + event.model_dump_json() + '}'
 
-		dead_clients = set()
-		for client in self._websocket_clients:
-			try:
-				await client.send_text(message)
-			except Exception:
-				dead_clients.add(client)
+		clients = list(self._websocket_clients)
+		results = await asyncio.gather(*(client.send_text(message) for client in clients), return_exceptions=True)
 
 		# Remove dead clients
+		dead_clients = {client for client, result in zip(clients, results) if isinstance(result, Exception)}
 		self._websocket_clients -= dead_clients
 
 
@@ -159,7 +161,7 @@ class EventBus:
 		if self._event_history:
 			history_message = json.dumps({
 				"type": "event_history",
-				"events": [e.model_dump() for e in self._event_history[-50:]]
+				"events": [e.model_dump() for e in list(self._event_history)[-50:]]
 			})
 			await websocket.send_text(history_message)
 
@@ -176,7 +178,7 @@ class EventBus:
 		limit        : int                 = 100
 	) -> List[WorkflowEvent]:
 		"""Get filtered event history"""
-		events = self._event_history
+		events = list(self._event_history)
 
 		if workflow_id:
 			events = [e for e in events if e.workflow_id == workflow_id]
@@ -210,7 +212,7 @@ class EventBus:
 		error        : Optional[str]            = None
 	):
 		"""Helper to create and publish event"""
-		event = WorkflowEvent(
+		event = WorkflowEvent.fast_new(
 			event_id     = self._generate_event_id(),
 			event_type   = event_type,
 			timestamp    = datetime.now().isoformat(),
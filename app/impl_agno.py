@@ -1,10 +1,10 @@
 # impl_agno
 
-import copy
 import os
 import tempfile
 
 
+from   collections                     import defaultdict
 from   fastapi                         import FastAPI
 from   typing                          import Any, List
 
@@ -34,53 +34,92 @@ from   nodes                           import ImplementedBackend
 from   utils                           import add_middleware, get_timestamp_str
 
 
+AGNO_NODE_TYPES = frozenset({
+	"info_config",
+	"backend_config",
+	"model_config",
+	"embedding_config",
+	"content_db_config",
+	"index_db_config",
+	"tool_config",
+	"agent_options_config",
+	"memory_manager_config",
+	"session_manager_config",
+	"knowledge_manager_config",
+	"agent_config",
+})
+
+
+AGNO_SEARCH_TYPES = {
+	"hybrid"  : SearchType.hybrid,
+	"keyword" : SearchType.keyword,
+	"vector"  : SearchType.vector,
+}
+
+
+def _make_agno_model(source: str, name: str) -> Any:
+	if source == "ollama":
+		return Ollama(id=name)
+	if source == "openai":
+		return OpenAIChat(id=name)
+	raise ValueError(f"Unsupported Agno model")
+
+
+def _make_agno_embedder(source: str) -> Any:
+	if source == "ollama":
+		return OllamaEmbedder()
+	if source == "openai":
+		return OpenAIEmbedder()
+	raise ValueError(f"Unsupported Agno embedding")
+
+
 def build_backend_agno(workflow: Workflow) -> ImplementedBackend:
 
+	# identically configured dbs are opened once and shared by every node using them
+	db_cache = {}
+
+	# same for models and embedders, scoped to this backend so workflows never share their state
+	model_cache = {}
+
+
 	def _get_search_type(value: str) -> SearchType:
-		if value == "hybrid":
-			return SearchType.hybrid
-		if value == "keyword":
-			return SearchType.keyword
-		if value == "vector":
-			return SearchType.vector
-		raise ValueError(f"Invalid Agno db search type: {value}")
+		search_type = AGNO_SEARCH_TYPES.get(value)
+		if search_type is None:
+			raise ValueError(f"Invalid Agno db search type: {value}")
+		return search_type
 
 
 	def _build_info(workflow: Workflow, links: List[Any], impl: List[Any], index: int):
 		item_config = workflow.nodes[index]
 		assert item_config is not None and item_config.type == "info_config", "Invalid Agno info"
-		item = copy.deepcopy(item_config)
+		item = item_config
 		impl[index] = item
 
 
 	def _build_backend(workflow: Workflow, links: List[Any], impl: List[Any], index: int):
 		item_config = workflow.nodes[index]
 		assert item_config is not None and item_config.type == "backend_config", "Invalid Agno backend"
-		item = copy.deepcopy(item_config)
+		item = item_config
 		impl[index] = item
 
 
 	def _build_model(workflow: Workflow, links: List[Any], impl: List[Any], index: int):
 		item_config = workflow.nodes[index]
 		assert item_config is not None and item_config.type == "model_config", "Invalid Agno model"
-		if item_config.source == "ollama":
-			item = Ollama(id=item_config.name)
-		elif item_config.source == "openai":
-			item = OpenAIChat(id=item_config.name)
-		else:
-			raise ValueError(f"Unsupported Agno model")
+		key  = ("model", item_config.source, item_config.name)
+		item = model_cache.get(key)
+		if item is None:
+			item = model_cache[key] = _make_agno_model(item_config.source, item_config.name)
 		impl[index] = item
 
 
 	def _build_embedding(workflow: Workflow, links: List[Any], impl: List[Any], index: int):
 		item_config = workflow.nodes[index]
 		assert item_config is not None and item_config.type == "embedding_config", "Invalid Agno embedding"
-		if item_config.source == "ollama":
-			item = OllamaEmbedder()
-		elif item_config.source == "openai":
-			item = OpenAIEmbedder()
-		else:
-			raise ValueError(f"Unsupported Agno embedding")
+		key  = ("embedder", item_config.source)
+		item = model_cache.get(key)
+		if item is None:
+			item = model_cache[key] = _make_agno_embedder(item_config.source)
 		impl[index] = item
 
 
@@ -94,6 +133,10 @@ def build_backend_agno(workflow: Workflow) -> ImplementedBackend:
 		mkdb = supported_db_classes.get(item_config.engine)
 		if not mkdb:
 			raise ValueError(f"Unsupported Agno content db")
+		key = ("content_db", item_config.engine, item_config.url, item_config.memory_table_name, item_config.session_table_name, item_config.knowledge_table_name)
+		if key in db_cache:
+			impl[index] = db_cache[key]
+			return
 		item = mkdb[0](
 			db_file         = item_config.url,
 			memory_table    = item_config.memory_table_name,
@@ -106,7 +149,8 @@ def build_backend_agno(workflow: Workflow) -> ImplementedBackend:
 			# # Table to store all your knowledge content
 			**(mkdb[1]()),
 		)
-		impl[index] = item
+		db_cache[key] = item
+		impl[index]   = item
 
 
 	def _build_index_db(workflow: Workflow, links: List[Any], impl: List[Any], index: int):
@@ -135,11 +179,16 @@ def build_backend_agno(workflow: Workflow) -> ImplementedBackend:
 		if not mkdb:
 			raise ValueError(f"Unsupported Agno index db")
 		embedder = impl[links[index]["embedding"]] if item_config.embedding is not None else None
+		key      = ("index_db", item_config.engine, full_path, item_config.table_name, search_type, id(embedder))
+		if key in db_cache:
+			impl[index] = db_cache[key]
+			return
 		item     = mkdb[0](
 			embedder = embedder,
 			**(mkdb[1]()),
 		)
-		impl[index] = item
+		db_cache[key] = item
+		impl[index]   = item
 
 
 	def _build_memory_manager(workflow: Workflow, links: List[Any], impl: List[Any], index: int):
@@ -156,7 +205,7 @@ def build_backend_agno(workflow: Workflow) -> ImplementedBackend:
 	def _build_session_manager(workflow: Workflow, links: List[Any], impl: List[Any], index: int):
 		item_config = workflow.nodes[index]
 		assert item_config is not None and item_config.type == "session_manager_config", "Invalid Agno session manager"
-		item = copy.deepcopy(item_config)
+		item = item_config
 		impl[index] = item
 
 
@@ -192,31 +241,33 @@ def build_backend_agno(workflow: Workflow) -> ImplementedBackend:
 	def _build_agent_options(workflow: Workflow, links: List[Any], impl: List[Any], index: int):
 		item_config = workflow.nodes[index]
 		assert item_config is not None and item_config.type == "agent_options_config", "Invalid Agno agent options"
-		item = copy.deepcopy(item_config)
+		item = item_config
 		impl[index] = item
 
 
 	def _build_agent(workflow: Workflow, links: List[Any], impl: List[Any], index: int):
 		item_config = workflow.nodes[index]
 		assert item_config is not None and item_config.type == "agent_config", "Invalid Agno agent"
+		nodes = workflow.nodes
+		slots = links[index]
 
 		if True:
 			name = f"Numel Agno Agent {index}"
 			if item_config.info is not None:
-				info = impl[links[index]["info"]]
+				info = impl[slots["info"]]
 				if info.name:
 					name = info.name
 
 		if True:
-			model  = impl[links[index]["model"]] if item_config.model is not None else None
+			model  = impl[slots["model"]] if item_config.model is not None else None
 			if model is None:
 				raise ValueError(f"Agno agent model is required")
 
 		if True:
-			options = impl[links[index]["options"]] if item_config.info is not None else AgentOptionsConfig()
+			options = impl[slots["options"]] if item_config.info is not None else AgentOptionsConfig()
 
 		if True:
-			content_db = impl[links[index]["content_db"]] if item_config.content_db is not None else None
+			content_db = impl[slots["content_db"]] if item_config.content_db is not None else None
 
 		# TODO
 		tools = None
@@ -229,8 +280,8 @@ def build_backend_agno(workflow: Workflow) -> ImplementedBackend:
 			add_memories_to_context = False
 			memory_mgr              = None
 			if item_config.memory_mgr is not None:
-				memory_mgr_index        = links[index]["memory_mgr"]
-				memory_mgr_config       = workflow.nodes[memory_mgr_index]
+				memory_mgr_index        = slots["memory_mgr"]
+				memory_mgr_config       = nodes[memory_mgr_index]
 				enable_agentic_memory   = memory_mgr_config.managed
 				add_memories_to_context = memory_mgr_config.query
 				enable_user_memories    = memory_mgr_config.update
@@ -241,8 +292,8 @@ def build_backend_agno(workflow: Workflow) -> ImplementedBackend:
 			num_history_sessions    = None
 			session_summary_manager = None
 			if item_config.session_mgr is not None:
-				session_mgr_index      = links[index]["session_mgr"]
-				session_mgr_config     = workflow.nodes[session_mgr_index]
+				session_mgr_index      = slots["session_mgr"]
+				session_mgr_config     = nodes[session_mgr_index]
 				search_session_history = session_mgr_config.query
 				num_history_sessions   = session_mgr_config.history_size
 				if session_mgr_config.model is not None or session_mgr_config.prompt:
@@ -291,28 +342,14 @@ def build_backend_agno(workflow: Workflow) -> ImplementedBackend:
 		impl[index] = item
 
 
-	indices = {
-		"info_config"              : [],
-		"backend_config"           : [],
-		"model_config"             : [],
-		"embedding_config"         : [],
-		"content_db_config"        : [],
-		"index_db_config"          : [],
-		"tool_config"              : [],
-		"agent_options_config"     : [],
-		"memory_manager_config"    : [],
-		"session_manager_config"   : [],
-		"knowledge_manager_config" : [],
-		"agent_config"             : [],
-	}
-
+	indices      = defaultdict(list)
 	unused_nodes = []
 	for i, node in enumerate(workflow.nodes):
-		indices.get(node.type, unused_nodes).append(i)
+		(indices[node.type] if node.type in AGNO_NODE_TYPES else unused_nodes).append(i)
 
 	default_embedding_index = None
 	default_embedding       = None
-	for i in indices["index_db_config"]:
+	for i in indices.get("index_db_config", ()):
 		item_config = workflow.nodes[i]
 		if item_config.embedding is None:
 			if default_embedding_index is None:
@@ -329,41 +366,51 @@ def build_backend_agno(workflow: Workflow) -> ImplementedBackend:
 			workflow.edges.append(edge)
 			item_config.embedding = default_embedding
 
-	links = [dict() for _ in range(len(workflow.nodes))]
+	# slot tables only for nodes with incoming edges, readers are gated on the linked field
+	links = [None] * len(workflow.nodes)
 	for edge in workflow.edges:
-		links[edge.target][edge.target_slot] = edge.source
+		slots = links[edge.target]
+		if slots is None:
+			slots = links[edge.target] = {}
+		slots[edge.target_slot] = edge.source
 
 	impl = [None] * len(workflow.nodes)
 
-	for i in indices["info_config"             ]: _build_info              (workflow, links, impl, i)
-	for i in indices["backend_config"          ]: _build_backend           (workflow, links, impl, i)
-	for i in indices["model_config"            ]: _build_model             (workflow, links, impl, i)
-	for i in indices["embedding_config"        ]: _build_embedding         (workflow, links, impl, i)
-	for i in indices["content_db_config"       ]: _build_content_db        (workflow, links, impl, i)
-	for i in indices["index_db_config"         ]: _build_index_db          (workflow, links, impl, i)
-	for i in indices["memory_manager_config"   ]: _build_memory_manager    (workflow, links, impl, i)
-	for i in indices["session_manager_config"  ]: _build_session_manager   (workflow, links, impl, i)
-	for i in indices["knowledge_manager_config"]: _build_knowledge_manager (workflow, links, impl, i)
-	for i in indices["tool_config"             ]: _build_tool              (workflow, links, impl, i)
-	for i in indices["agent_options_config"    ]: _build_agent_options     (workflow, links, impl, i)
-	for i in indices["agent_config"            ]: _build_agent             (workflow, links, impl, i)
+	build_phases = (
+		("info_config"             , _build_info),
+		("backend_config"          , _build_backend),
+		("model_config"            , _build_model),
+		("embedding_config"        , _build_embedding),
+		("content_db_config"       , _build_content_db),
+		("index_db_config"         , _build_index_db),
+		("memory_manager_config"   , _build_memory_manager),
+		("session_manager_config"  , _build_session_manager),
+		("knowledge_manager_config", _build_knowledge_manager),
+		("tool_config"             , _build_tool),
+		("agent_options_config"    , _build_agent_options),
+		("agent_config"            , _build_agent),
+	)
+
+	for node_type, build in build_phases:
+		for i in indices.get(node_type, ()):
+			build(workflow, links, impl, i)
 
 
 	async def run_tool(tool: Any, *args, **kwargs) -> dict:
 		raw    = await tool(*args, **kwargs)
-		result = dict(
-			content_type = "",
-			content      = raw,
-		)
+		result = {
+			"content_type" : "",
+			"content"      : raw,
+		}
 		return result
 
 
 	async def run_agent(agent: Any, *args, **kwargs) -> dict:
 		raw    = await agent.arun(input=args, **kwargs)
-		result = dict(
-			content_type = raw.content_type,
-			content      = raw.content,
-		)
+		result = {
+			"content_type" : raw.content_type,
+			"content"      : raw.content,
+		}
 		return result
 
 
@@ -420,6 +467,14 @@ def build_backend_agno(workflow: Workflow) -> ImplementedBackend:
 		return result
 
 
+	def close() -> None:
+		# dbs backed by an sqlalchemy engine release their pooled connections
+		for db in db_cache.values():
+			engine = getattr(db, "db_engine", None)
+			if engine is not None:
+				engine.dispose()
+
+
 	backend = ImplementedBackend(
 		handles         = impl,
 		run_tool        = run_tool,
@@ -427,6 +482,7 @@ def build_backend_agno(workflow: Workflow) -> ImplementedBackend:
 		get_agent_app   = get_agent_app,
 		add_contents    = add_contents,
 		remove_contents = remove_contents,
+		close           = close,
 	)
 
 	return backend
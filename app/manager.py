@@ -7,27 +7,32 @@ import uvicorn
 
 
 # from   pathlib   import Path
-from   typing    import Any, Callable, Dict, List, Optional
+from   typing    import Any, Callable, Dict, List, Optional, Tuple
 
 
 from   event_bus import EventType, EventBus
 from   schema    import InfoConfig, Workflow, WorkflowOptionsConfig
-from   utils     import serialize_result
+from   utils     import serialize_result, splice_json
 
 
-from   nodes     import ImplementedBackend
+from   nodes     import ImplementedBackend, bind_node_types
 from   impl_agno import build_backend_agno
 
 
+DEFAULT_MAX_WORKFLOWS : int = 1024
+
+
 class WorkflowManager:
 
 	# def __init__(self, event_bus: EventBus, storage_dir: str = "workflows"):
-	def __init__(self, port: int, event_bus: EventBus):
-		self._port            : int                 = port
-		self._event_bus       : EventBus            = event_bus
-		self._current_id      : int                 = 0
-		self._workflows       : Dict[str, Any     ] = {}
-		self._upload_handlers : Dict[str, Callable] = {}
+	def __init__(self, port: int, event_bus: EventBus, max_workflows: int = DEFAULT_MAX_WORKFLOWS):
+		self._port            : int                     = port
+		self._max_workflows   : int                     = max_workflows
+		self._event_bus       : EventBus                = event_bus
+		self._current_id      : int                     = 0
+		self._workflows       : Dict[str, Any         ] = {}
+		self._upload_handlers : Dict[str, Callable    ] = {}
+		self._impl_locks      : Dict[str, asyncio.Lock] = {}
 
 		# self._storage_dir = Path(storage_dir)
 		# self._storage_dir.mkdir(exist_ok=True)
@@ -46,6 +51,7 @@ class WorkflowManager:
 		self._current_id      = 0
 		self._workflows       = {}
 		self._upload_handlers = {}
+		self._impl_locks      = {}
 		await self._event_bus.emit(
 			event_type = EventType.MANAGER_CLEARED,
 		)
@@ -105,15 +111,9 @@ class WorkflowManager:
 
 
 	async def add(self, workflow: Workflow, name: Optional[str] = None) -> str:
-		wf = copy.deepcopy(workflow)
-		if not name:
-			if wf.info and wf.info.name:
-				name = wf.info.name
-			else:
-				self._current_id += 1
-				name = f"workflow_{self._current_id}"
+		wf, name = self._prepare_workflow(workflow, name)
 		await self.remove(name)
-		wf.link()
+		await self._make_room()
 		self._workflows[name] = self._make_workflow(wf)
 		await self._event_bus.emit(
 			event_type = EventType.MANAGER_WORKFLOW_ADDED,
@@ -121,6 +121,23 @@ class WorkflowManager:
 		return name
 
 
+	async def add_many(self, workflows: List[Workflow], names: Optional[List[Optional[str]]] = None) -> List[str]:
+		if names is None:
+			names = [None] * len(workflows)
+		result = []
+		for workflow, name in zip(workflows, names):
+			wf, name = self._prepare_workflow(workflow, name)
+			await self._drop_workflows([name])
+			await self._make_room()
+			self._workflows[name] = self._make_workflow(wf)
+			result.append(name)
+		await self._event_bus.emit(
+			event_type = EventType.MANAGER_WORKFLOW_ADDED,
+			data       = {"count": len(result)},
+		)
+		return result
+
+
 	async def remove(self, name: Optional[str] = None) -> bool:
 		if not name:
 			names = list(self._workflows.keys())
@@ -128,12 +145,21 @@ class WorkflowManager:
 			names = [name]
 		else:
 			return False
-		for key in names:
-			data = self._workflows[key]
-			await self._kill_workflow(data)
-			del self._workflows[key]
+		await self._drop_workflows(names)
+		await self._event_bus.emit(
+			event_type = EventType.MANAGER_WORKFLOW_REMOVED,
+		)
+		return True
+
+
+	async def remove_many(self, names: List[str]) -> bool:
+		names = [key for key in names if key in self._workflows]
+		if not names:
+			return False
+		await self._drop_workflows(names)
 		await self._event_bus.emit(
 			event_type = EventType.MANAGER_WORKFLOW_REMOVED,
+			data       = {"count": len(names)},
 		)
 		return True
 
@@ -153,16 +179,44 @@ class WorkflowManager:
 		return result
 
 
+	async def get_json(self, name: Optional[str] = None) -> Optional[bytes]:
+		if not name:
+			result = splice_json({key: self._workflow_json(value) for key, value in self._workflows.items()})
+		elif name in self._workflows:
+			result = self._workflow_json(self._workflows[name])
+		else:
+			return None
+		await self._event_bus.emit(
+			event_type = EventType.MANAGER_WORKFLOW_GOT,
+		)
+		return result
+
+
 	async def impl(self, name: Optional[str] = None) -> Any:
 		if not name:
 			name = list(self._workflows.keys())[-1] if self._workflows else None
+		if name not in self._workflows:
+			return None
+		# serialized per workflow so concurrent callers never build the same one twice
+		lock = self._impl_locks.get(name)
+		if lock is None:
+			lock = self._impl_locks[name] = asyncio.Lock()
+		async with lock:
+			return await self._impl(name)
+
+
+	async def _impl(self, name: str) -> Any:
 		data = self._workflows.get(name)
 		if not data:
 			return None
 		if data["backend"] is not None:
 			return data
-		workflow = data["workflow"]
-		backend  = self._build_backend(workflow)
+		# the backend build mutates the workflow in a worker thread, readers keep the stored one until the swap
+		workflow = copy.deepcopy(data["workflow"])
+		backend  = await self._build_backend(workflow)
+		if self._workflows.get(name) is not data:
+			await self._close_backend(backend)
+			return None
 		apps     = [None] * len(backend.handles)
 		host     = "0.0.0.0"
 		port     = self._port + 1
@@ -170,7 +224,7 @@ class WorkflowManager:
 			if node.type != "agent_config":
 				continue
 			app    = backend.get_agent_app(handle)
-			config = uvicorn.Config(app, host=host, port=port)
+			config = uvicorn.Config(app, host=host, port=port, access_log=False)
 			server = uvicorn.Server(config)
 			task   = asyncio.create_task(server.serve())
 			info   = {
@@ -182,8 +236,10 @@ class WorkflowManager:
 			apps[i]   = info
 			node.port = port
 			port += 1
-		data["backend"] = backend
-		data["apps"   ] = apps
+		data["workflow"] = workflow
+		data["backend" ] = backend
+		data["apps"    ] = apps
+		data["json"    ] = None
 		await self._event_bus.emit(
 			event_type = EventType.MANAGER_WORKFLOW_IMPL,
 		)
@@ -198,15 +254,53 @@ class WorkflowManager:
 		return result
 
 
+	def _prepare_workflow(self, workflow: Workflow, name: Optional[str]) -> Tuple[Workflow, str]:
+		wf = copy.deepcopy(workflow)
+		if not name:
+			if wf.info and wf.info.name:
+				name = wf.info.name
+			else:
+				self._current_id += 1
+				name = f"workflow_{self._current_id}"
+		wf.link()
+		bind_node_types(wf.nodes)
+		return wf, name
+
+
+	async def _drop_workflows(self, names: List[str]):
+		for key in names:
+			data = self._workflows.get(key)
+			if data is None:
+				continue
+			await self._kill_workflow(data)
+			del self._workflows[key]
+			self._impl_locks.pop(key, None)
+
+
+	async def _make_room(self):
+		# evict the oldest added workflows, the newest one stays the default for impl()
+		overflow = len(self._workflows) - self._max_workflows + 1
+		if overflow > 0:
+			await self._drop_workflows(list(self._workflows.keys())[:overflow])
+
+
 	def _make_workflow(self, workflow: Workflow) -> Any:
 		result = {
 			"workflow" : workflow,
 			"backend"  : None,
 			"apps"     : None,
+			"json"     : None,
 		}
 		return result
 
 
+	def _workflow_json(self, data: Any) -> bytes:
+		# serialized once, invalidated when the workflow is changed by impl
+		if data["json"] is None:
+			data["json"] = data["workflow"].model_dump_json().encode()
+		return data["json"]
+
+
 	async def _kill_workflow(self, data: Any):
 		if data["apps"]:
 			for item in data["apps"]:
@@ -218,10 +312,18 @@ class WorkflowManager:
 					server.should_exit = True
 				if task:
 					await task
+		if data["backend"] is not None:
+			await self._close_backend(data["backend"])
+
+
+	async def _build_backend(self, workflow: Workflow) -> ImplementedBackend:
+		# backend constructors open databases and clients, keep them off the event loop
+		return await asyncio.to_thread(build_backend_agno, workflow)
 
 
-	def _build_backend(self, workflow: Workflow) -> ImplementedBackend:
-		return build_backend_agno(workflow)
+	async def _close_backend(self, backend: ImplementedBackend):
+		if backend.close is not None:
+			await asyncio.to_thread(backend.close)
 
 
 	# def load(self, filepath: str, name: Optional[str] = None) -> Workflow:
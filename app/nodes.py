@@ -1,22 +1,48 @@
 # nodes
 
-from jinja2   import Template
-from pydantic import BaseModel
-from typing   import Any, Callable, Dict, List, Optional
+import asyncio
 
 
-from schema   import DEFAULT_TRANSFORM_NODE_LANG, DEFAULT_TRANSFORM_NODE_SCRIPT, DEFAULT_TRANSFORM_NODE_CONTEXT, BaseType
+from collections import defaultdict
+from functools   import lru_cache
+from jinja2      import Environment, Template
+from types       import CodeType
+from pydantic    import BaseModel
+from typing      import Any, Callable, Dict, List, Optional
+
+
+from schema      import DEFAULT_TRANSFORM_NODE_LANG, DEFAULT_TRANSFORM_NODE_SCRIPT, DEFAULT_TRANSFORM_NODE_CONTEXT, BaseType
+
+
+_JINJA_ENV = Environment(autoescape=False)
+
+
+@lru_cache(maxsize=256)
+def _compile_template(script: str) -> Template:
+	# identical scripts across nodes and executions share one compiled template
+	return _JINJA_ENV.from_string(script)
+
+
+@lru_cache(maxsize=512)
+def _compile_script(script: str) -> CodeType:
+	# parsed once per distinct source, exec then runs the code object
+	return compile(script, "<wf_script>", "exec")
 
 
 class NodeExecutionContext:
+	__slots__ = ("inputs", "grouped_inputs", "variables", "node_index", "node_config")
+
 	def __init__(self):
-		self.inputs      : Dict[str, Any] = {}
-		self.variables   : Dict[str, Any] = {}
-		self.node_index  : int            = 0
-		self.node_config : Dict[str, Any] = {}
+		self.inputs         : Dict[str, Any]            = {}
+		self.grouped_inputs : Dict[str, Dict[str, Any]] = {}
+		self.variables      : Dict[str, Any]            = {}
+		self.node_index     : int                       = 0
+		self.node_config    : Dict[str, Any]            = {}
 
 
 class NodeExecutionResult:
+	__slots__ = ("outputs", "success", "error", "next_target")
+
 	def __init__(self):
 		self.outputs     : Dict[str, Any] = {}
 		self.success     : bool           = True
@@ -99,10 +125,14 @@ class WFBinaryDataNode(WFBaseDataNode):
 
 
 class WFBaseConfig(WFBaseType):
+	def __init__(self, config: Dict[str, Any] = None, impl: Any = None, **kwargs):
+		super().__init__(config, impl, **kwargs)
+		# config nodes are constant, the engine only reads results
+		self._result = NodeExecutionResult()
+		self._result.outputs["get"] = self.config
+
 	async def execute(self, context: NodeExecutionContext) -> NodeExecutionResult:
-		result = NodeExecutionResult()
-		result.outputs["get"] = self.config
-		return result
+		return self._result
 
 
 class WFInfoConfig(WFBaseConfig):
@@ -185,93 +215,116 @@ class WFPassThroughNode(WFBaseNode):
 
 class WFRouteNode(WFBaseNode):
 	async def execute(self, context: NodeExecutionContext) -> NodeExecutionResult:
-		result = NodeExecutionResult()
-		
-		try:
-			target  = context.inputs.get("target")
-			outputs = self.config.output or {}
+		result  = NodeExecutionResult()
+		target  = context.inputs.get("target")
+		outputs = self.config.output or {}
 
-			if not target in outputs:
-				target = "default"
+		if not isinstance(target, str) or not target in outputs:
+			target = "default"
 
-			result.outputs[target] = context.inputs.get("input")
-			result.next_target = target
+		result.outputs[target] = context.inputs.get("input")
+		result.next_target = target
 
-		except Exception as e:
-			result.success = False
-			result.error   = str(e)
-			
 		return result
 
 
 class WFCombineNode(WFBaseNode):
 	async def execute(self, context: NodeExecutionContext) -> NodeExecutionResult:
-		result = NodeExecutionResult()
-		
-		try:
-			inputs = {}
-			for key, value in context.inputs.items():
-				if key.startswith("input."):
-					_, name, _ = key.split(".")
-					inputs[name].append(value)
-
-			mapping = context.inputs.get("mapping", {})
-			for key, value in mapping.items():
-				key  = str(key)
-				name = f"output.{value}"
-				result.outputs[name] = inputs[key]
+		result  = NodeExecutionResult()
+		mapping = context.inputs.get("mapping", {})
 
-		except Exception as e:
+		if not isinstance(mapping, dict):
 			result.success = False
-			result.error   = str(e)
-			
+			result.error   = f"invalid mapping of type '{type(mapping).__name__}'"
+			return result
+
+		inputs = defaultdict(list)
+		for key, value in context.grouped_inputs.get("input", {}).items():
+			name = key.partition(".")[0]
+			inputs[name].append(value)
+
+		for key, value in mapping.items():
+			key  = str(key)
+			name = f"output.{value}"
+			result.outputs[name] = inputs[key]
+
 		return result
 
 
+def _merge_first(inputs: List[Any]) -> Any:
+	return inputs[0] if inputs else None
+
+
+def _merge_last(inputs: List[Any]) -> Any:
+	return inputs[-1] if inputs else None
+
+
+def _merge_concat(inputs: List[Any]) -> Any:
+	if not inputs:
+		return inputs
+	# the first input decides which homogeneous check is worth running
+	kind = type(inputs[0])
+	if kind is str and all(type(i) is str for i in inputs):
+		return "".join(inputs)
+	if kind is list and all(type(i) is list for i in inputs):
+		merged = []
+		for i in inputs:
+			merged.extend(i)
+		return merged
+	return inputs
+
+
+def _merge_all(inputs: List[Any]) -> Any:
+	return inputs
+
+
+_MERGE_STRATEGIES = {
+	"first"  : _merge_first,
+	"last"   : _merge_last,
+	"concat" : _merge_concat,
+	"all"    : _merge_all,
+}
+
+
 class WFMergeNode(WFBaseNode):
 	async def execute(self, context: NodeExecutionContext) -> NodeExecutionResult:
-		result = NodeExecutionResult()
+		result   = NodeExecutionResult()
+		strategy = context.inputs.get("strategy", "first")
+		merge    = _MERGE_STRATEGIES.get(strategy) if isinstance(strategy, str) else None
 
-		try:
-			strategy = context.inputs.get("strategy", "first")
-
-			inputs = []
-			for key, value in context.inputs.items():
-				if key.startswith("input."):
-					inputs.append(value)
-
-			if strategy == "first":
-				merged = inputs[0] if inputs else None
-			elif strategy == "last":
-				merged = inputs[-1] if inputs else None
-			elif strategy == "concat":
-				if inputs and all(isinstance(i, str) for i in inputs):
-					merged = "".join(inputs)
-				elif inputs and all(isinstance(i, list) for i in inputs):
-					merged = sum(inputs, [])
-				else:
-					merged = inputs
-			elif strategy == "all":
-				merged = inputs
-			else:
-				raise f"invalid strategy '{strategy}'"
+		if merge is None:
+			result.success = False
+			result.error   = f"invalid strategy '{strategy}'"
+			return result
 
-			result.outputs["output"] = merged
+		inputs = list(context.grouped_inputs.get("input", {}).values())
 
-		except Exception as e:
-			result.success = False
-			result.error   = str(e)
+		result.outputs["output"] = merge(inputs)
 
 		return result
 
 
 class WFTransformNode(WFBaseNode):
+	def __init__(self, config: Dict[str, Any] = None, impl: Any = None, **kwargs):
+		super().__init__(config, impl, **kwargs)
+		# configured script is compiled once, wired inputs override it per execution
+		self._lang     = getattr(self.config, "lang"  , DEFAULT_TRANSFORM_NODE_LANG  )
+		self._script   = getattr(self.config, "script", DEFAULT_TRANSFORM_NODE_SCRIPT)
+		self._template = None
+		try:
+			if self._lang == "jinja2":
+				self._template = _compile_template(self._script)
+		except Exception:
+			# left unset, the error is reported when the node executes
+			pass
+
+
 	async def execute(self, context: NodeExecutionContext) -> NodeExecutionResult:
 		result = NodeExecutionResult()
 		
 		try:
-			lang   = context.inputs.get("lang"   , DEFAULT_TRANSFORM_NODE_LANG   )
-			script = context.inputs.get("script" , DEFAULT_TRANSFORM_NODE_SCRIPT )
+			lang   = context.inputs.get("lang"   , self._lang                    )
+			script = context.inputs.get("script" , self._script                  )
 			ctx    = context.inputs.get("context", DEFAULT_TRANSFORM_NODE_CONTEXT)
 			input  = context.inputs.get("input"  , {})
 
@@ -282,10 +335,12 @@ class WFTransformNode(WFBaseNode):
 					"input"     : input,
 					"output"    : None,
 				}
-				exec(script, {"__builtins__": {}}, local_vars)
+				exec(_compile_script(script), {"__builtins__": {}}, local_vars)
 				output = local_vars.get("output", input)
 			elif lang == "jinja2":
-				template = Template(script)
+				template = self._template if lang == self._lang and script == self._script else None
+				if template is None:
+					template = _compile_template(script)
 				output = template.render(input=input, **context.variables)
 			else:
 				output = input
@@ -338,6 +393,36 @@ class WFToolNode(WFBaseNode):
 		return result
 
 
+class WFToolBatchNode(WFToolNode):
+	async def execute(self, context: NodeExecutionContext) -> NodeExecutionResult:
+		result = NodeExecutionResult()
+
+		args   = context.inputs.get("args" , {})
+		inputs = context.inputs.get("input", [])
+
+		if not isinstance(inputs, list):
+			result.success = False
+			result.error   = f"invalid input of type '{type(inputs).__name__}'"
+			return result
+
+		if self.ref:
+			# independent calls run concurrently, a failing call does not cancel the others
+			responses = await asyncio.gather(*(self.ref(input, **args) for input in inputs), return_exceptions=True)
+			outputs   = [{"error": str(r)} if isinstance(r, Exception) else r for r in responses]
+		else:
+			outputs = [{"error": "No tool configured"} for _ in inputs]
+
+		result.outputs["output"] = outputs
+
+		return result
+
+
+def _agent_message(request: Any) -> str:
+	if isinstance(request, dict):
+		return request.get("message") or request.get("text") or request.get("value") or request.get("data") or request.get("input") or str(request)
+	return str(request)
+
+
 class WFAgentNode(WFBaseNode):
 	def __init__(self, config: Dict[str, Any], impl: Any = None, **kwargs):
 		assert "ref" in kwargs, "WFAgentNode requires 'ref' argument"
@@ -350,10 +435,7 @@ class WFAgentNode(WFBaseNode):
 
 		try:
 			request = context.inputs.get("input", "")
-			if isinstance(request, dict):
-				message = request.get("message") or request.get("text") or request.get("value") or request.get("data") or request.get("input") or str(request)
-			else:
-				message = str(request)
+			message = _agent_message(request)
 
 			if self.ref:
 				response = await self.ref(message)
@@ -372,6 +454,40 @@ class WFAgentNode(WFBaseNode):
 		return result
 
 
+class WFAgentBatchNode(WFAgentNode):
+	async def execute(self, context: NodeExecutionContext) -> NodeExecutionResult:
+		result = NodeExecutionResult()
+
+		requests = context.inputs.get("input", [])
+
+		if not isinstance(requests, list):
+			result.success = False
+			result.error   = f"invalid input of type '{type(requests).__name__}'"
+			return result
+
+		if self.ref:
+			# requests share the agent and its session, so they run one after another; a failing request does not stop the others
+			responses = []
+			for request in requests:
+				try:
+					response = await self.ref(_agent_message(request))
+				except Exception as e:
+					response = {"error": str(e)}
+				responses.append(response)
+		else:
+			responses = [{"error": "No agent configured"} for _ in requests]
+
+		result.outputs["output"] = [
+			{
+				"request"  : request,
+				"response" : response,
+			}
+			for request, response in zip(requests, responses)
+		]
+
+		return result
+
+
 class WFBaseInteractive(WFBaseType):
 	pass
 
@@ -391,6 +507,7 @@ class ImplementedBackend(BaseModel):
 	get_agent_app   : Callable
 	add_contents    : Callable
 	remove_contents : Callable
+	close           : Optional[Callable] = None
 
 
 _NODE_TYPES = {
@@ -434,13 +551,24 @@ _NODE_TYPES = {
 	"transform_node"           : WFTransformNode,
 	"user_input_node"          : WFUserInputNode,
 	"tool_node"                : WFToolNode,
+	"tool_batch_node"          : WFToolBatchNode,
 	"agent_node"               : WFAgentNode,
+	"agent_batch_node"         : WFAgentBatchNode,
 
 	"tool_call"                : WFToolCall,
 	"agent_chat"               : WFAgentChat,
 }
 
 
+def bind_node_types(nodes: List[BaseType]) -> None:
+	for node in nodes or []:
+		node_class = _NODE_TYPES.get(node.type, WFBaseType)
+		object.__setattr__(node, "_wf_cls", node_class)
+
+
 def create_node(node: BaseType, impl: Any = None, **kwargs) -> WFBaseType:
-	node_class = _NODE_TYPES.get(node.type, WFBaseType)
+	node_class = getattr(node, "_wf_cls", None)
+	if node_class is None:
+		node_class = _NODE_TYPES.get(node.type, WFBaseType)
+		object.__setattr__(node, "_wf_cls", node_class)
 	return node_class(node, impl, **kwargs)
@@ -4,8 +4,9 @@ from __future__ import annotations
 
 
 from enum       import Enum
-from pydantic   import BaseModel, Field
-from typing     import Annotated, Any, Dict, List, Literal, Optional, Union
+from functools  import lru_cache
+from pydantic   import BaseModel, ConfigDict, Field
+from typing     import Annotated, Any, Dict, List, Literal, Optional, Tuple, Union
 from uuid       import uuid4
 
 
@@ -61,6 +62,8 @@ def generate_id():
 
 @node_info(visible=False)
 class BaseType(BaseModel):
+	model_config = ConfigDict(defer_build=True)
+
 	type  : Annotated[Literal["base_type"]    , FieldRole.CONSTANT  ] = "base_type"
 	id    : Annotated[str                     , FieldRole.ANNOTATION] = Field(default_factory=generate_id)
 	data  : Annotated[Optional[Any]           , FieldRole.INPUT     ] = None
@@ -84,6 +87,13 @@ class Edge(BaseType):
 	target_slot : Annotated[str            , FieldRole.INPUT     ] = None
 
 
+@lru_cache(maxsize=1024)
+def split_slot(slot: str) -> Tuple[str, Optional[str]]:
+	# slot names repeat across edges and runs, each distinct one is split once
+	base, *parts = slot.split(".")
+	return base, (parts[0] if parts else None)
+
+
 # ========================================================================
 # NATIVE VALUE NODES
 # ========================================================================
@@ -846,6 +856,35 @@ class AgentNode(BaseNode):
 	output : Annotated[Any                  , FieldRole.OUTPUT  ] = None
 
 
+@node_info(
+	title       = "Tool Batch Proxy",
+	description = "Proxy for concurrent tool invocations, one per input item",
+	icon        = "🔧",
+	section     = "Workflow",
+	visible     = True
+)
+class ToolBatchNode(BaseNode):
+	type   : Annotated[Literal["tool_batch_node"], FieldRole.CONSTANT] = "tool_batch_node"
+	config : Annotated[ToolConfig                , FieldRole.INPUT   ] = None
+	args   : Annotated[Dict[str, Any]            , FieldRole.INPUT   ] = DEFAULT_TOOL_NODE_ARGS
+	input  : Annotated[List[Any]                 , FieldRole.INPUT   ] = None
+	output : Annotated[List[Any]                 , FieldRole.OUTPUT  ] = None
+
+
+@node_info(
+	title       = "Agent Batch Proxy",
+	description = "Proxy for sequential agent invocations, one per input item",
+	icon        = "🤖",
+	section     = "Workflow",
+	visible     = True
+)
+class AgentBatchNode(BaseNode):
+	type   : Annotated[Literal["agent_batch_node"], FieldRole.CONSTANT] = "agent_batch_node"
+	config : Annotated[AgentConfig                , FieldRole.INPUT   ] = None
+	input  : Annotated[List[Any]                  , FieldRole.INPUT   ] = None
+	output : Annotated[List[Any]                  , FieldRole.OUTPUT  ] = None
+
+
 # ========================================================================
 # INTERACTIVE NODES
 # ========================================================================
@@ -943,6 +982,8 @@ WorkflowNodeUnion = Union[
 	UserInputNode,
 	ToolNode,
 	AgentNode,
+	ToolBatchNode,
+	AgentBatchNode,
 
 	# Interactive nodes
 	ToolCall,
@@ -967,6 +1008,19 @@ class WorkflowOptionsConfig(BaseConfig):
 		return self
 
 
+_MULTI_ROLES       = frozenset((FieldRole.MULTI_INPUT, FieldRole.MULTI_OUTPUT))
+_MULTI_ROLE_FIELDS = {}
+
+
+def _multi_role_fields(cls: type) -> Tuple[str, ...]:
+	# field roles are fixed per class, scan the metadata once
+	fields = _MULTI_ROLE_FIELDS.get(cls)
+	if fields is None:
+		fields = tuple(name for name, info in cls.model_fields.items() if not _MULTI_ROLES.isdisjoint(info.metadata))
+		_MULTI_ROLE_FIELDS[cls] = fields
+	return fields
+
+
 @node_info(visible=False)
 class Workflow(BaseConfig):
 	type    : Annotated[Literal["workflow"]            , FieldRole.CONSTANT] = "workflow"
@@ -980,29 +1034,26 @@ class Workflow(BaseConfig):
 		return self
 
 	def link(self):
-		roles = (FieldRole.MULTI_INPUT, FieldRole.MULTI_OUTPUT)
 		for node in self.nodes or []:
-			for name, info in node.model_fields.items():
-				for meta in info.metadata:
-					if meta in roles:
-						value = getattr(node, name)
-						if isinstance(value, list):
-							remap = {key: None for key in value}
-							setattr(node, name, remap)
+			for name in _multi_role_fields(type(node)):
+				value = getattr(node, name)
+				if isinstance(value, list):
+					remap = dict.fromkeys(value)
+					setattr(node, name, remap)
 
 		for edge in self.edges or []:
 			source_node = self.nodes[edge.source]
 			target_node = self.nodes[edge.target]
 
-			src_base, *src_parts = edge.source_slot.split(".")
+			src_base, src_key = split_slot(edge.source_slot)
 			src_value = getattr(source_node, src_base)
-			if src_parts:
-				src_value = src_value[src_parts[0]]
+			if src_key is not None:
+				src_value = src_value[src_key]
 
-			dst_base, *dst_parts = edge.target_slot.split(".")
-			if dst_parts:
+			dst_base, dst_key = split_slot(edge.target_slot)
+			if dst_key is not None:
 				dst_field = getattr(target_node, dst_base)
-				dst_field[dst_parts[0]] = src_value
+				dst_field[dst_key] = src_value
 			else:
 				setattr(target_node, dst_base, src_value)
 
@@ -1021,16 +1072,6 @@ NATIVE_NODE_TYPES = {
 }
 
 
-NATIVE_NODE_TYPES = {
-	"native_string" : StringNode,
-	"native_integer": IntegerNode,
-	"native_float"  : FloatNode,
-	"native_boolean": BooleanNode,
-	"native_list"   : ListNode,
-	"native_dict"   : DictNode,
-}
-
-
 # ========================================================================
 # MAIN
 # ========================================================================
@@ -5,7 +5,7 @@ import os
 
 
 from   datetime                import datetime, timezone
-from   typing                  import Optional
+from   typing                  import Any, Dict, Optional
 from   fastapi                 import FastAPI
 from   fastapi.middleware.cors import CORSMiddleware
 
@@ -76,3 +76,9 @@ def serialize_result(result):
 		return result
 	except (TypeError, ValueError):
 		return str(result)
+
+
+def splice_json(fields: Dict[str, Any]) -> bytes:
+	# bytes values are already serialized JSON and are spliced in as they are
+	items = [json.dumps(key).encode() + b":" + (value if isinstance(value, bytes) else json.dumps(value).encode()) for key, value in fields.items()]
+	return b"{" + b",".join(items) + b"}"
@@ -487,20 +487,21 @@ def build_backend_agno(workflow: Workflow) -> ImplementedBackend:
 	def _build_agent(workflow: Workflow, links: List[Any], impl: List[Any], index: int):
 		item_config = workflow.nodes[index]
 		assert item_config is not None and item_config.type == "agent_config", "Invalid Agno agent"
+		slots = links[index]
 
 		if True:
 			name         = f"Numel Agno Agent {index}"
 			description  = None
 			instructions = None
 			if item_config.info is not None:
-				info = impl[links[index]["info"]]
+				info = impl[slots["info"]]
 				if info.name:
 					name = info.name
 				description  = info.description
 				instructions = info.instructions
 
 		if True:
-			prompt_index = links[index]["prompt"] if item_config.prompt is not None else None
+			prompt_index = slots["prompt"] if item_config.prompt is not None else None
 			if prompt_index is None:
 				raise ValueError(f"Agno agent prompt is required")
 			prompt = impl[prompt_index]
@@ -509,11 +510,11 @@ def build_backend_agno(workflow: Workflow) -> ImplementedBackend:
 				raise ValueError(f"Agno agent prompt model is required")
 
 		if True:
-			options  = impl[links[index]["info"]] if item_config.info is not None else AgentOptionsConfig()
+			options  = impl[slots["info"]] if item_config.info is not None else AgentOptionsConfig()
 			markdown = options.markdown
 
 		if True:
-			content_db = impl[links[index]["content_db"]] if item_config.content_db is not None else None
+			content_db = impl[slots["content_db"]] if item_config.content_db is not None else None
 
 		# TODO
 		tools = None
@@ -526,7 +527,7 @@ def build_backend_agno(workflow: Workflow) -> ImplementedBackend:
 			add_memories_to_context = False
 			memory_mgr              = None
 			if item_config.memory_mgr is not None:
-				memory_mgr_index        = links[index]["memory_mgr"]
+				memory_mgr_index        = slots["memory_mgr"]
 				memory_mgr_config       = workflow.nodes[memory_mgr_index]
 				enable_agentic_memory   = memory_mgr_config.managed
 				add_memories_to_context = memory_mgr_config.query
@@ -538,14 +539,14 @@ def build_backend_agno(workflow: Workflow) -> ImplementedBackend:
 			num_history_sessions    = None
 			session_summary_manager = None
 			if item_config.session_mgr is not None:
-				session_mgr_config     = workflow.nodes[links[index]["memory_mgr"]]
+				session_mgr_config     = workflow.nodes[slots["session_mgr"]]
 				search_session_history = session_mgr_config.query
 				num_history_sessions   = session_mgr_config.history_size
 				if session_mgr_config.summarize:
 					session_model          = None
 					session_summary_prompt = None
 					if item_config.session_mgr.prompt is not None:
-						session_prompt_index = links[index]["prompt"] if item_config.prompt is not None else None
+						session_prompt_index = slots["prompt"] if item_config.prompt is not None else None
 						if session_prompt_index is None:
 							raise ValueError(f"Agno agent session prompt is required")
 						session_prompt = impl[session_prompt_index]
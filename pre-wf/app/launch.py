@@ -6,9 +6,12 @@ import os
 import uvicorn
 
 
+from   dataclasses             import dataclass, field
 from   dotenv                  import load_dotenv
-from   fastapi                 import FastAPI, HTTPException
+from   fastapi                 import FastAPI
+from   fastapi.responses       import JSONResponse, ORJSONResponse
 from   fastapi.middleware.cors import CORSMiddleware
+from   typing                  import Any, Dict, List, Optional
 
 
 from core import (
@@ -47,9 +50,34 @@ from workflow_engine import (
 
 load_dotenv()
 
+
+try:
+	import orjson
+	DEFAULT_RESPONSE_CLASS = ORJSONResponse
+except ImportError:
+	DEFAULT_RESPONSE_CLASS = JSONResponse
+
+
+try:
+	import uvloop
+	DEFAULT_ASYNC_RUN = uvloop.run
+except ImportError:
+	DEFAULT_ASYNC_RUN = asyncio.run
+
+
 current_dir = os.path.dirname(os.path.abspath(__file__))
 
 
+@dataclass(slots=True)
+class AppState:
+	config          : AppConfig
+	ctrl_server     : Any                      = None
+	ctrl_status     : Optional[Dict[str, Any]] = None
+	apps            : Optional[List[Any]]      = None
+	running_servers : List[Dict[str, Any]]     = field(default_factory=list)
+	workflow_eng    : Optional[WorkflowEngine] = None
+
+
 def add_middleware(app: FastAPI) -> None:
 	app.add_middleware(
 		CORSMiddleware,
@@ -108,7 +136,7 @@ if True:
 		}
 	except Exception as e:
 		log_print(f"Error reading workflow schema: {e}")
-		raise HTTPException(status_code=500, detail=str(e))
+		raise e
 
 
 if True:
@@ -121,8 +149,7 @@ if True:
 
 
 if True:
-	event_bus    = get_event_bus()
-	workflow_eng = None
+	event_bus = get_event_bus()
 
 
 if True:
@@ -136,14 +163,14 @@ if True:
 
 
 if True:
-	ctrl_server     = None
-	ctrl_status     = {
-		"config" : None,
-		"status" : "waiting",
-	}
-	apps            = None
-	running_servers = []
-	ctrl_app        = FastAPI(title="Control")
+	state = AppState(
+		config      = config,
+		ctrl_status = {
+			"config" : None,
+			"status" : "waiting",
+		},
+	)
+	ctrl_app = FastAPI(title="Control", default_response_class=DEFAULT_RESPONSE_CLASS)
 	add_middleware(ctrl_app)
 
 
@@ -177,29 +204,27 @@ async def export_workflow_schema():
 
 @ctrl_app.post("/import")
 async def import_config(cfg: dict):
-	global apps, config, ctrl_status
-	if apps is not None:
+	if state.apps is not None:
 		return {"error": "App is running"}
 	new_config = AppConfig(**cfg)
 	new_config = adjust_config(new_config)
 	if new_config is None:
 		return {"error": "Invalid app configuration"}
-	config = new_config
-	ctrl_status["status"] = "ready"
-	return config
+	state.config = new_config
+	state.ctrl_status["status"] = "ready"
+	return state.config
 
 
 @ctrl_app.post("/export")
 async def export_config():
-	global config
-	return config
+	return state.config
 
 
 @ctrl_app.post("/start")
 async def start_app():
-	global apps, config, ctrl_status, running_servers, workflow_eng
-	if apps is not None:
+	if state.apps is not None:
 		return {"error": "App is already running"}
+	config = state.config
 	try:
 		host       = "0.0.0.0"
 		agent_port = config.port + 1
@@ -209,6 +234,7 @@ async def start_app():
 		active_agents = [True] * len(config.agents)
 		backends      = get_backends()
 		apps          = []
+		state.apps    = apps
 
 		agent_index   = 0
 		agent_remap   = {}
@@ -230,14 +256,14 @@ async def start_app():
 				agent_app = app.generate_app(i)
 				add_middleware(agent_app)
 
-				agent_config = uvicorn.Config(agent_app, host=host, port=agent_port)
+				agent_config = uvicorn.Config(agent_app, host=host, port=agent_port, access_log=False)
 				agent_server = uvicorn.Server(agent_config)
 				agent_task   = asyncio.create_task(agent_server.serve())
 				item         = {
 					"server" : agent_server,
 					"task"   : agent_task,
 				}
-				running_servers.append(item)
+				state.running_servers.append(item)
 
 				config.agents[agent_index].port = agent_port
 				agent_index += 1
@@ -247,104 +273,106 @@ async def start_app():
 		workflow_ctx = WorkflowContext (apps, agent_remap, tool_remap)
 		workflow_eng = WorkflowEngine  (workflow_ctx, event_bus)
 		setup_workflow_api(ctrl_app, workflow_eng, event_bus)
+		state.workflow_eng = workflow_eng
 
 		log_print("✅ Workflow engine initialized")
 
-		ctrl_status["config"] = config
-		ctrl_status["status"] = "running"
+		state.ctrl_status["config"] = config
+		state.ctrl_status["status"] = "running"
 
 	except Exception as e:
 		log_print(f"Error starting app: {e}")
 		return {"error": str(e)}
 
-	return ctrl_status
+	return state.ctrl_status
 
 
 @ctrl_app.post("/stop")
 async def stop_app():
-	global apps, config, ctrl_status, running_servers, workflow_eng
-	if apps is None:
+	if state.apps is None:
 		return {"error": "App is not running"}
 	try:
-		for item in running_servers:
+		for item in state.running_servers:
 			server = item["server"]
 			task   = item["task"  ]
 			if server and server.should_exit is False:
 				server.should_exit = True
 			if task:
 				await task
-		for app in apps:
+		for app in state.apps:
 			app.close()
-		for agent in config.agents:
+		for agent in state.config.agents:
 			agent.port = 0
 		
 		# Clean up workflow engine
-		workflow_eng = None
+		state.workflow_eng = None
 		log_print("Workflow engine stopped")
 		
-		apps                  = None
-		running_servers       = []
-		ctrl_status["config"] = None
-		ctrl_status["status"] = "stopped"
+		state.apps                  = None
+		state.running_servers       = []
+		state.ctrl_status["config"] = None
+		state.ctrl_status["status"] = "stopped"
 	except Exception as e:
 		log_print(f"Error stopping app: {e}")
 		return {"error": str(e)}
-	return ctrl_status
+	return state.ctrl_status
 
 
 @ctrl_app.post("/restart")
 async def restart_app():
-	global ctrl_status
 	await stop_app()
 	await asyncio.sleep(1)
 	await start_app()
-	return ctrl_status
+	return state.ctrl_status
 
 
 @ctrl_app.post("/status")
 async def server_status():
-	global ctrl_status, workflow_eng
+	workflow_eng = state.workflow_eng
 	
-	status = dict(ctrl_status)
+	# Serialized right away, no copy needed when there is nothing to add
+	if not workflow_eng:
+		return state.ctrl_status
 	
 	# Add workflow engine status
-	if workflow_eng:
-		status["workflow_eng"] = {
+	status = {
+		**state.ctrl_status,
+		"workflow_eng": {
 			"active_executions": len(workflow_eng.executions),
 			"event_history_size": len(event_bus._event_history)
-		}
+		},
+	}
 	
 	return status
 
 
 @ctrl_app.post("/shutdown")
 async def shutdown_server():
-	global apps, ctrl_app, ctrl_server, ctrl_status, workflow_eng
-	if apps is not None:
+	global ctrl_app
+	if state.apps is not None:
 		return {"error": "App is running"}
-	if ctrl_server and ctrl_server.should_exit is False:
-		ctrl_server.should_exit = True
+	if state.ctrl_server and state.ctrl_server.should_exit is False:
+		state.ctrl_server.should_exit = True
 	
 	# Clean up workflow engine
-	workflow_eng = None
+	state.workflow_eng = None
 	
-	ctrl_app    = None
-	ctrl_server = None
-	ctrl_status = None
+	ctrl_app          = None
+	state.ctrl_server = None
+	state.ctrl_status = None
 	return {"message": "Server shut down"}
 
 
 async def run_server():
-	global config, ctrl_app, ctrl_server
-
 	host        = "0.0.0.0"
-	ctrl_config = uvicorn.Config(ctrl_app, host=host, port=config.port)
+	ctrl_config = uvicorn.Config(ctrl_app, host=host, port=state.config.port, access_log=False)
 	ctrl_server = uvicorn.Server(ctrl_config)
+	state.ctrl_server = ctrl_server
 
 	await ctrl_server.serve()
 
 
 if __name__ == "__main__":
 	log_print("Server starting...")
-	asyncio.run(run_server())
+	DEFAULT_ASYNC_RUN(run_server())
 	log_print("Server shut down")
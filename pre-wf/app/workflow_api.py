@@ -28,6 +28,12 @@ class UserInputRequest(BaseModel):
 		pass
 
 
+def invalidate_openapi(app: FastAPI):
+	"""Rebuild the cached OpenAPI document after the route table changed"""
+	app.openapi_schema = None
+	app.openapi()
+
+
 def setup_workflow_api(app: FastAPI, workflow_engine: WorkflowEngine, event_bus: EventBus):
 	"""Setup workflow API endpoints"""
 
@@ -117,6 +123,6 @@ def setup_workflow_api(app: FastAPI, workflow_engine: WorkflowEngine, event_bus:
 
 	app.add_api_websocket_route("/workflow/events", workflow_events_websocket)
 
-	app.openapi_schema = None
+	invalidate_openapi(app)
 	
 	log_print("✅ Workflow API endpoints registered")
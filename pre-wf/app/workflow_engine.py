@@ -310,7 +310,7 @@ class WorkflowEngine:
 
 		try:
 			context = NodeExecutionContext()
-			context.inputs      = self._gather_inputs(edges, node_idx, node_outputs)
+			context.inputs, context.grouped_inputs = self._gather_inputs(edges, node_idx, node_outputs)
 			context.variables   = variables
 			context.node_index  = node_idx
 			context.node_config = node_config
@@ -338,9 +338,10 @@ class WorkflowEngine:
 			return node_idx, result
 
 	def _gather_inputs(self, edges: List, node_idx: int,
-					node_outputs: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
-		"""Gather input data from connected edges"""
+					node_outputs: Dict[int, Dict[str, Any]]) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+		"""Gather input data from connected edges, dotted slots are also grouped by their base name"""
 		inputs = {}
+		grouped = {}
 		
 		for edge in edges:
 			# Handle both dict and Pydantic model
@@ -374,8 +375,14 @@ class WorkflowEngine:
 				
 				if data is not None:
 					inputs[target_slot] = data
+					base, dot, name = target_slot.partition(".")
+					if dot:
+						group = grouped.get(base)
+						if group is None:
+							group = grouped[base] = {}
+						group[name] = data
 		
-		return inputs
+		return inputs, grouped
 	
 	async def _handle_user_input(self, node_idx: int, node: Any,
 								context: NodeExecutionContext,
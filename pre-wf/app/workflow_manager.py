@@ -1,6 +1,7 @@
 # workflow_manager
 
 import json
+import os
 
 
 from   pathlib         import Path
@@ -8,7 +9,16 @@ from   typing          import Dict, List, Optional
 
 
 from   schema          import AppConfig, InfoConfig
-from   workflow_schema import WorkflowConfig
+from   workflow_schema import WorkflowConfig, WorkflowEdgeConfig, WorkflowNodeConfig, check_edge_indices
+
+
+try:
+	import ijson
+except ImportError:
+	ijson = None
+
+
+STREAMING_LOAD_MIN_SIZE : int = 1_000_000
 
 
 class WorkflowManager:
@@ -26,10 +36,11 @@ class WorkflowManager:
 
 	def load_workflow(self, filepath: str) -> WorkflowConfig:
 		"""Load workflow from JSON file"""
-		with open(filepath, 'r') as f:
-			data = json.load(f)
-		
-		workflow = WorkflowConfig(**data)
+		if ijson is not None and Path(filepath).stat().st_size > STREAMING_LOAD_MIN_SIZE:
+			workflow = self.load_workflow_streaming(filepath)
+		else:
+			with open(filepath, 'rb') as f:
+				workflow = WorkflowConfig.parse_fast(f.read())
 		
 		# Validate against app config
 		errors = workflow.validate_against_app_config(self.app_config)
@@ -40,16 +51,93 @@ class WorkflowManager:
 		return workflow
 	
 
+	def load_workflow_streaming(self, filepath: str) -> WorkflowConfig:
+		"""Load large workflow JSON file node by node in a single parse pass (requires ijson)"""
+		nodes = []
+		edges = []
+		values = {"info": None, "variables": None}
+		
+		builder = None
+		target = None
+		with open(filepath, 'rb') as f:
+			for prefix, event, value in ijson.parse(f, use_float=True):
+				if builder is not None:
+					builder.event(event, value)
+					# Nested containers have longer prefixes, so this closes the one being built
+					if prefix == target and event in ("end_map", "end_array"):
+						if target == "nodes.item":
+							nodes.append(WorkflowNodeConfig(**builder.value))
+						elif target == "edges.item":
+							edges.append(WorkflowEdgeConfig(**builder.value))
+						else:
+							values[target] = builder.value
+						builder = None
+					continue
+				
+				if prefix in ("nodes.item", "edges.item", "info", "variables"):
+					if event in ("start_map", "start_array"):
+						builder = ijson.ObjectBuilder()
+						builder.event(event, value)
+						target = prefix
+					elif prefix in values:
+						values[prefix] = value
+		
+		info = values["info"]
+		variables = values["variables"]
+		
+		# Nodes and edges are already validated, only edge indices are left
+		check_edge_indices(edges, len(nodes))
+		
+		workflow = WorkflowConfig.model_construct(
+			info=InfoConfig(**info) if info else InfoConfig(),
+			nodes=nodes,
+			edges=edges,
+			variables=variables
+		)
+		return workflow
+	
+
+	def _workflow_path(self, workflow: WorkflowConfig) -> Path:
+		"""Default storage path of a workflow, derived from its name"""
+		filename = f"{workflow.info.name.lower().replace(' ', '_')}.json"
+		return self.storage_dir / filename
+	
+
 	def save_workflow(self, workflow: WorkflowConfig, filepath: Optional[str] = None):
 		"""Save workflow to JSON file"""
 		if filepath is None:
-			filename = f"{workflow.info.name.lower().replace(' ', '_')}.json"
-			filepath = self.storage_dir / filename
+			filepath = self._workflow_path(workflow)
 		
 		with open(filepath, 'w') as f:
 			json.dump(workflow.model_dump(), f, indent=2)
 	
 
+	def save_all(self, workflows: Optional[List[WorkflowConfig]] = None):
+		"""Save several workflows to the storage directory, syncing the directory once"""
+		if workflows is None:
+			workflows = list(self.workflows.values())
+		
+		for workflow in workflows:
+			filepath = self._workflow_path(workflow)
+			tmp_path = filepath.with_name(filepath.name + ".tmp")
+			data = json.dumps(workflow.model_dump(), indent=2).encode("utf-8")
+			# Old contents stay intact until the synced temp file replaces them
+			fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+			with os.fdopen(fd, "wb") as f:
+				f.write(data)
+				f.flush()
+				os.fsync(f.fileno())
+			os.replace(tmp_path, filepath)
+		
+		# File contents are synced above, a single directory sync then makes all renames durable
+		if hasattr(os, "O_DIRECTORY"):
+			dirfd = os.open(self.storage_dir, os.O_DIRECTORY)
+			try:
+				os.fsync(dirfd)
+			finally:
+				os.close(dirfd)
+	
+
 	def list_workflows(self) -> List[str]:
 		"""List all loaded workflow names"""
 		return list(self.workflows.keys())
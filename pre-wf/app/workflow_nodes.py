@@ -1,25 +1,50 @@
 # workflow_nodes.py
 # Node executors for workflow_schema_new.py
 
-from jinja2   import Template
-from pydantic import BaseModel
-from typing   import Any, Callable, Dict, List, Optional
+import sys
+
+
+from functools import lru_cache
+from jinja2    import Environment, Template
+from pydantic  import BaseModel
+from types     import CodeType
+from typing    import Any, Callable, Dict, List, Optional
 
 
 from workflow_schema_new import BaseType
 
 
+_JINJA_ENV = Environment(autoescape=False)
+
+
+@lru_cache(maxsize=256)
+def _compile_template(script: str) -> Template:
+	"""Compile a Jinja2 script once, identical scripts share the template"""
+	return _JINJA_ENV.from_string(script)
+
+
+@lru_cache(maxsize=512)
+def _compile_script(script: str) -> CodeType:
+	"""Compile a Python script once, exec then runs the code object"""
+	return compile(script, "<wf_script>", "exec")
+
+
 class NodeExecutionContext:
 	"""Data flowing into a node"""
+	__slots__ = ("inputs", "grouped_inputs", "variables", "node_index", "node_config")
+
 	def __init__(self):
-		self.inputs      : Dict[str, Any] = {} # {slot_name: data}
-		self.variables   : Dict[str, Any] = {} # Global workflow variables
-		self.node_index  : int            = 0
-		self.node_config : Dict[str, Any] = {} # Full node configuration
+		self.inputs         : Dict[str, Any]            = {} # {slot_name: data}
+		self.grouped_inputs : Dict[str, Dict[str, Any]] = {} # {base_slot: {sub_slot: data}} for dotted slots
+		self.variables      : Dict[str, Any]            = {} # Global workflow variables
+		self.node_index     : int                       = 0
+		self.node_config    : Dict[str, Any]            = {} # Full node configuration
 
 
 class NodeExecutionResult:
 	"""Data flowing out of a node"""
+	__slots__ = ("outputs", "success", "error", "next_target")
+
 	def __init__(self):
 		self.outputs     : Dict[str, Any] = {}  # {slot_name: data}
 		self.success     : bool           = True
@@ -31,6 +56,13 @@ class NodeExecutionResult:
 # BASE TYPE
 # ========================================================================
 
+def _unwrap_message(value: Any, default: Any) -> Any:
+	"""Unwrap a config entry in Message format: {"type": "", "value": ...}"""
+	if isinstance(value, dict):
+		return value.get("value", default)
+	return value
+
+
 class WFBaseType:
 	"""All nodes inherit from this"""
 	
@@ -50,10 +82,14 @@ class WFBaseType:
 class WFBaseConfig(WFBaseType):
 	"""Base class for config nodes"""
 	
+	def __init__(self, config: Dict[str, Any] = None, impl: Any = None, **kwargs):
+		super().__init__(config, impl, **kwargs)
+		# config nodes are constant, the engine only reads results
+		self._result = NodeExecutionResult()
+		self._result.outputs = {"get": self.config}
+	
 	async def execute(self, context: NodeExecutionContext) -> NodeExecutionResult:
-		result = NodeExecutionResult()
-		result.outputs = {"get": self.config}
-		return result
+		return self._result
 
 
 # ========================================================================
@@ -161,18 +197,27 @@ class WFSinkNode(WFBaseNode):
 class WFScriptNode(WFBaseNode):
 	"""Base class for script-executing nodes"""
 	
+	def __init__(self, config: Dict[str, Any] = None, impl: Any = None, **kwargs):
+		super().__init__(config, impl, **kwargs)
+		# config does not change after construction, unwrap and compile once
+		self._lang     = self._get_lang()
+		self._script   = self._get_script()
+		self._code     = None
+		self._template = None
+		try:
+			if self._lang == "python":
+				self._code = _compile_script(self._script)
+			elif self._lang == "jinja2":
+				self._template = _compile_template(self._script)
+		except Exception:
+			# left unset, the error is reported when the node executes
+			pass
+	
 	def _get_lang(self) -> str:
-		lang = self.config.get("lang", "python")
-		# Handle Message format: {"type": "", "value": "python"}
-		if isinstance(lang, dict):
-			return lang.get("value", "python")
-		return lang
+		return _unwrap_message(self.config.get("lang", "python"), "python")
 	
 	def _get_script(self) -> str:
-		script = self.config.get("script", "")
-		if isinstance(script, dict):
-			return script.get("value", "")
-		return script
+		return _unwrap_message(self.config.get("script", ""), "")
 
 
 class WFTransformNode(WFScriptNode):
@@ -183,8 +228,8 @@ class WFTransformNode(WFScriptNode):
 		
 		try:
 			input_data = context.inputs.get("source", {})
-			lang = self._get_lang()
-			script = self._get_script()
+			lang = self._lang
+			script = self._script
 			
 			if lang == "python":
 				local_vars = {
@@ -193,14 +238,14 @@ class WFTransformNode(WFScriptNode):
 					"variables": context.variables,
 					"__target": None,
 				}
-				exec(script, {"__builtins__": {}}, local_vars)
+				exec(self._code or _compile_script(script), {"__builtins__": {}}, local_vars)
 				output = local_vars.get("output", input_data)
 				
 				if local_vars.get("__target"):
 					result.next_target = local_vars["__target"]
 				
 			elif lang == "jinja2":
-				template = Template(script)
+				template = self._template or _compile_template(script)
 				output = template.render(input=input_data, **context.variables)
 			else:
 				output = input_data
@@ -217,19 +262,27 @@ class WFTransformNode(WFScriptNode):
 class WFSwitchNode(WFScriptNode):
 	"""Routes data based on script evaluation to cases or default"""
 	
+	def __init__(self, config: Dict[str, Any] = None, impl: Any = None, **kwargs):
+		super().__init__(config, impl, **kwargs)
+		# case keys and their output slot names are fixed by the config, built names are interned like the literal ones
+		cases = self.config.get("cases", {})
+		self._case_keys  = tuple(cases.keys()) if isinstance(cases, dict) else ()
+		self._case_slots = {case_key: sys.intern(f"cases.{case_key}") for case_key in self._case_keys}
+		# a script made of a single expression selects the case directly, without binding val
+		self._expr = None
+		if self._script and self._lang == "python":
+			try:
+				self._expr = compile(self._script, "<wf_script>", "eval")
+			except SyntaxError:
+				pass
+	
 	async def execute(self, context: NodeExecutionContext) -> NodeExecutionResult:
 		result = NodeExecutionResult()
 		
 		try:
 			input_value = context.inputs.get("value", {})
-			lang = self._get_lang()
-			script = self._get_script()
-			cases = self.config.get("cases", {})
-			
-			if isinstance(cases, dict):
-				case_keys = list(cases.keys())
-			else:
-				case_keys = []
+			lang = self._lang
+			script = self._script
 			
 			selected_case = "default"
 			
@@ -239,22 +292,29 @@ class WFSwitchNode(WFScriptNode):
 					"__value": input_value,
 					"val": None,
 				}
-				exec(script, {"__builtins__": {}}, local_vars)
-				selected_case = local_vars.get("val", "default")
+				if self._expr is not None:
+					selected_case = eval(self._expr, {"__builtins__": {}}, local_vars)
+				else:
+					exec(self._code or _compile_script(script), {"__builtins__": {}}, local_vars)
+					selected_case = local_vars.get("val", "default")
 			
-			# Output to matched case slot
-			for case_key in case_keys:
-				slot_name = f"cases.{case_key}"
-				is_matched = (selected_case == case_key)
+			# Every case slot gets its own unmatched record, then the selected one is flagged
+			for case_key, slot_name in self._case_slots.items():
 				result.outputs[slot_name] = {
 					"data": input_value,
-					"matched": is_matched,
+					"matched": False,
 					"case": case_key
 				}
 			
+			# config keys are strings, any other selection falls to default
+			selected_name = self._case_slots.get(selected_case) if isinstance(selected_case, str) else None
+			selected_slot = result.outputs[selected_name] if selected_name is not None else None
+			if selected_slot is not None:
+				selected_slot["matched"] = True
+			
 			result.outputs["default"] = {
 				"data": input_value,
-				"matched": (selected_case == "default" or selected_case not in case_keys),
+				"matched": (selected_case == "default" or selected_slot is None),
 				"case": "default"
 			}
 			
@@ -270,23 +330,27 @@ class WFSwitchNode(WFScriptNode):
 class WFSplitNode(WFScriptNode):
 	"""Splits data to multiple outputs based on mapping"""
 	
+	def __init__(self, config: Dict[str, Any] = None, impl: Any = None, **kwargs):
+		super().__init__(config, impl, **kwargs)
+		# mapping and target slot names are fixed by the config, outputs share references with the source
+		mapping = self.config.get("mapping", {})
+		if isinstance(mapping, dict):
+			mapping = mapping.get("value", mapping) if isinstance(mapping.get("value"), dict) else mapping
+		else:
+			mapping = {}
+		self._targets = tuple((sys.intern(f"targets.{target_key}"), source_path) for target_key, source_path in mapping.items())
+	
 	async def execute(self, context: NodeExecutionContext) -> NodeExecutionResult:
 		result = NodeExecutionResult()
 		
 		try:
 			source = context.inputs.get("source", {})
-			mapping = self.config.get("mapping", {})
-			
-			if isinstance(mapping, dict):
-				mapping_dict = mapping.get("value", mapping) if isinstance(mapping.get("value"), dict) else mapping
-			else:
-				mapping_dict = {}
 			
-			for target_key, source_path in mapping_dict.items():
-				slot_name = f"targets.{target_key}"
-				if isinstance(source, dict):
+			if isinstance(source, dict):
+				for slot_name, source_path in self._targets:
 					result.outputs[slot_name] = source.get(source_path, None)
-				else:
+			else:
+				for slot_name, _ in self._targets:
 					result.outputs[slot_name] = source
 			
 		except Exception as e:
@@ -296,37 +360,59 @@ class WFSplitNode(WFScriptNode):
 		return result
 
 
+def _merge_first(inputs: List[Any]) -> Any:
+	return inputs[0] if inputs else None
+
+
+def _merge_last(inputs: List[Any]) -> Any:
+	return inputs[-1] if inputs else None
+
+
+def _merge_concat(inputs: List[Any]) -> Any:
+	if not inputs:
+		return inputs
+	kind = type(inputs[0])
+	if kind is str and all(type(i) is str for i in inputs):
+		return "".join(inputs)
+	if kind is list and all(type(i) is list for i in inputs):
+		merged = []
+		for i in inputs:
+			merged.extend(i)
+		return merged
+	return inputs
+
+
+def _merge_all(inputs: List[Any]) -> Any:
+	return inputs
+
+
+# Unknown strategies fall back to "all"
+_MERGE_STRATEGIES = {
+	"first"  : _merge_first,
+	"last"   : _merge_last,
+	"concat" : _merge_concat,
+	"all"    : _merge_all,
+}
+
+
 class WFMergeNode(WFBaseNode):
 	"""Merges multiple inputs into one output"""
 	
+	def __init__(self, config: Dict[str, Any] = None, impl: Any = None, **kwargs):
+		super().__init__(config, impl, **kwargs)
+		# the strategy is fixed by the config, resolve it once
+		strategy    = _unwrap_message(self.config.get("strategy", "first"), "first")
+		self._merge = _MERGE_STRATEGIES.get(strategy, _merge_all) if isinstance(strategy, str) else _merge_all
+	
 	async def execute(self, context: NodeExecutionContext) -> NodeExecutionResult:
 		result = NodeExecutionResult()
 		
 		try:
-			strategy = self.config.get("strategy", "first")
-			if isinstance(strategy, dict):
-				strategy = strategy.get("value", "first")
-			
-			inputs = []
-			for key, value in context.inputs.items():
-				if key.startswith("sources."):
-					inputs.append(value)
+			merge = self._merge
 			
-			if strategy == "first":
-				merged = inputs[0] if inputs else None
-			elif strategy == "last":
-				merged = inputs[-1] if inputs else None
-			elif strategy == "concat":
-				if inputs and all(isinstance(i, str) for i in inputs):
-					merged = "".join(inputs)
-				elif inputs and all(isinstance(i, list) for i in inputs):
-					merged = sum(inputs, [])
-				else:
-					merged = inputs
-			else:  # "all"
-				merged = inputs
+			inputs = list(context.grouped_inputs.get("sources", {}).values())
 			
-			result.outputs = {"target": merged}
+			result.outputs = {"target": merge(inputs)}
 			
 		except Exception as e:
 			result.success = False
@@ -477,6 +563,9 @@ NODE_TYPES = {
 
 
 def create_node(node: BaseType, impl: Any = None, **kwargs) -> WFBaseType:
-	"""Factory function to create nodes"""
-	node_class = NODE_TYPES.get(node.type, WFBaseType)
+	"""Factory function to create nodes, the resolved class is kept on the node"""
+	node_class = getattr(node, "_wf_cls", None)
+	if node_class is None:
+		node_class = NODE_TYPES.get(node.type, WFBaseType)
+		object.__setattr__(node, "_wf_cls", node_class)
 	return node_class(node, impl, **kwargs)
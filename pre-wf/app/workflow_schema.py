@@ -1,8 +1,8 @@
 # workflow_schema
 
 from enum     import Enum
-from pydantic import BaseModel, field_validator
-from typing   import Any, Dict, List, Optional
+from pydantic import BaseModel, Field, field_validator
+from typing   import Any, Dict, List, Literal, Optional, Union
 
 
 from schema   import InfoConfig
@@ -21,6 +21,10 @@ class WorkflowNodeType(str, Enum):
 	USER_INPUT = "user_input"
 
 
+# Literal counterpart of WorkflowNodeType, validated without building Enum members
+WorkflowNodeTypeName = Literal["start", "end", "agent", "prompt", "tool", "transform", "decision", "merge", "user_input"]
+
+
 class WorkflowNodeStatus(str, Enum):
 	PENDING = "pending"
 	READY = "ready"
@@ -33,7 +37,7 @@ class WorkflowNodeStatus(str, Enum):
 class WorkflowNodeConfig(BaseModel):
 	"""Base node configuration"""
 	id: str
-	type: WorkflowNodeType
+	type: WorkflowNodeTypeName
 	label: Optional[str] = None
 	position: Optional[Dict[str, float]] = None
 	
@@ -55,19 +59,62 @@ class WorkflowEdgeConfig(BaseModel):
 
 class WorkflowConfig(BaseModel):
 	"""Complete workflow definition"""
-	info: InfoConfig = InfoConfig()
-	nodes: List[WorkflowNodeConfig] = []
-	edges: List[WorkflowEdgeConfig] = []
+	info: InfoConfig = Field(default_factory=InfoConfig)
+	nodes: List[WorkflowNodeConfig] = Field(default_factory=list)
+	edges: List[WorkflowEdgeConfig] = Field(default_factory=list)
 	variables: Optional[Dict[str, Any]] = None
 	
+	@classmethod
+	def parse_fast(cls, data: Union[bytes, str, Dict[str, Any]]) -> "WorkflowConfig":
+		"""Validate raw JSON directly, skipping the intermediate Python objects"""
+		if isinstance(data, (bytes, str)):
+			return cls.model_validate_json(data)
+		return cls.model_validate(data)
+	
 	@field_validator('edges')
 	def validate_edges(cls, edges, info):
 		"""Validate edge indices"""
 		if 'nodes' in info.data:
-			node_count = len(info.data['nodes'])
-			for edge in edges:
-				if edge.source < 0 or edge.source >= node_count:
-					raise ValueError(f"Invalid edge source: {edge.source}")
-				if edge.target < 0 or edge.target >= node_count:
-					raise ValueError(f"Invalid edge target: {edge.target}")
+			check_edge_indices(edges, len(info.data['nodes']))
 		return edges
+	
+	def validate_against_app_config(self, app_config: Any) -> List[str]:
+		"""Check node references into the app config, returns error messages"""
+		errors = []
+		for i, node in enumerate(self.nodes):
+			check = _APP_CONFIG_CHECKS.get(node.type)
+			if check is not None:
+				check(node, i, app_config, errors)
+		return errors
+
+
+def check_edge_indices(edges: List[WorkflowEdgeConfig], node_count: int) -> None:
+	"""Raise on the first edge pointing outside [0, node_count)"""
+	valid = range(node_count)
+	if all(edge.source in valid and edge.target in valid for edge in edges):
+		return
+	for edge in edges:
+		if edge.source not in valid:
+			raise ValueError(f"Invalid edge source: {edge.source}")
+		if edge.target not in valid:
+			raise ValueError(f"Invalid edge target: {edge.target}")
+
+
+def _check_ref(key: str, collection: str):
+	"""Build a checker for a node config entry indexing into an app config list"""
+	def check(node: WorkflowNodeConfig, i: int, app_config: Any, errors: List[str]) -> None:
+		ref = (node.config or {}).get(key)
+		if ref is None:
+			return
+		items = getattr(app_config, collection, None) or []
+		if not isinstance(ref, int) or ref < 0 or ref >= len(items):
+			errors.append(f"Node {i} ({node.id}): invalid {key} reference {ref!r}")
+	return check
+
+
+# Node type -> reference check, built once at import
+_APP_CONFIG_CHECKS = {
+	WorkflowNodeType.AGENT  : _check_ref("agent" , "agents" ),
+	WorkflowNodeType.TOOL   : _check_ref("tool"  , "tools"  ),
+	WorkflowNodeType.PROMPT : _check_ref("prompt", "prompts"),
+}